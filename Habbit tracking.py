@@ -1,18 +1,60 @@
 #!/usr/bin/env python3
 """Modernus iprociu seklys su korteliu stiliumi, lentelėmis ir motyvacijos citatomis."""
 
+import html
+import re
+import threading
+import time
 import tkinter as tk
+from collections import deque
+from contextlib import contextmanager
 from datetime import date
 from tkinter import messagebox, ttk
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 import requests
-from bs4 import BeautifulSoup
-from sqlalchemy import Column, Date, ForeignKey, Integer, String, create_engine
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
-
-engine = create_engine('sqlite:///habits.db', echo=False)
-Session = sessionmaker(bind=engine)
+from sqlalchemy import Column, Date, ForeignKey, Integer, String, create_engine, event, insert, select
+from sqlalchemy.orm import declarative_base, relationship, scoped_session, sessionmaker
+from sqlalchemy.engine import Row
+from sqlalchemy.pool import SingletonThreadPool
+
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'cache_size=-20000',
+    'temp_store=MEMORY',
+    'mmap_size=268435456',
+)
+
+# Vienas Tk gijos ryšys visam programos gyvavimui.
+engine = create_engine(
+    'sqlite:///habits.db',
+    echo=False,
+    # Visos užklausos statinės, todėl kompiliuotas SQL imamas iš podėlio.
+    query_cache_size=1200,
+    poolclass=SingletonThreadPool,
+    connect_args={'check_same_thread': False},
+)
+
+
+@event.listens_for(engine, 'connect')
+def apply_sqlite_pragmas(dbapi_conn, _record) -> None:
+    cursor = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f'PRAGMA {pragma}')
+    cursor.close()
+
+
+# Laukai paprasti skaliarai, todėl po commit jų perkrauti iš DB nereikia.
+Session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+QUOTE_URL = 'https://quotes.toscrape.com/random'
+QUOTE_RE = re.compile(
+    r'<span class="text"[^>]*>(.*?)</span>.*?<small class="author"[^>]*>(.*?)</small>', re.S
+)
+QUOTE_CACHE_SIZE = 32
+QUOTE_REUSE_MIN = 8
+QUOTE_REUSE_SECONDS = 60.0
 Base = declarative_base()
 
 
@@ -22,7 +64,7 @@ class Habit(Base):
     __tablename__ = 'habits'
 
     id = Column(Integer, primary_key=True)
-    category = Column(String, nullable=False)
+    category = Column(String, nullable=False, index=True)
     desc = Column(String, default='')
     created_at = Column(Date, default=date.today)
     logs = relationship('Log', back_populates='habit', cascade='all, delete-orphan')
@@ -38,7 +80,7 @@ class Log(Base):
     __tablename__ = 'logs'
 
     id = Column(Integer, primary_key=True)
-    habit_id = Column(Integer, ForeignKey('habits.id'))
+    habit_id = Column(Integer, ForeignKey('habits.id'), index=True)
     date = Column(Date, default=date.today)
     status = Column(String)
     note = Column(String, default='')
@@ -48,31 +90,87 @@ class Log(Base):
 Base.metadata.create_all(engine)
 
 
+def ensure_indexes() -> None:
+    # create_all indeksus sukuria tik naujoms lentelėms, todėl senai DB pridedame atskirai.
+    with engine.begin() as conn:
+        conn.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_habits_category ON habits (category)')
+        conn.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_logs_habit_id ON logs (habit_id)')
+
+
+ensure_indexes()
+
+
 class App(tk.Tk):
     """Pagrindinis tkinter langas su kortelėmis, lentelėmis ir citatomis."""
 
+    COLORS = {
+        'bg': '#0f172a',
+        'card': '#1f2937',
+        'accent': '#38bdf8',
+        'muted': '#94a3b8',
+        'success': '#22c55e',
+        'danger': '#ef4444',
+    }
+
+    # (metodas, stilius, parinktys) – taikoma vienu ciklu setup_styles metu.
+    _STYLE_SPEC = (
+        ('configure', 'App.TFrame', {'background': COLORS['bg']}),
+        ('configure', 'Card.TFrame', {'background': COLORS['card']}),
+        ('configure', 'Hero.TLabel', {'background': COLORS['card'], 'foreground': 'white',
+                                      'font': ('Segoe UI', 24, 'bold')}),
+        ('configure', 'HeroSub.TLabel', {'background': COLORS['card'], 'foreground': COLORS['muted'],
+                                         'font': ('Segoe UI', 11)}),
+        ('configure', 'Quote.TLabel', {'background': COLORS['card'], 'foreground': '#e2e8f0',
+                                       'font': ('Segoe UI', 11, 'italic'), 'wraplength': 720,
+                                       'justify': 'left'}),
+        ('configure', 'CardHeading.TLabel', {'background': COLORS['card'], 'foreground': 'white',
+                                             'font': ('Segoe UI Semibold', 12)}),
+        ('configure', 'CardBody.TLabel', {'background': COLORS['card'], 'foreground': COLORS['muted'],
+                                          'font': ('Segoe UI', 10)}),
+        ('configure', 'Primary.TButton', {'background': COLORS['accent'], 'foreground': '#0f172a',
+                                          'font': ('Segoe UI Semibold', 10), 'padding': 8}),
+        ('map', 'Primary.TButton', {'background': [('active', '#22d3ee'), ('pressed', '#0ea5e9')],
+                                    'foreground': [('pressed', '#0f172a')]}),
+        ('configure', 'Danger.TButton', {'background': COLORS['danger'], 'foreground': 'white',
+                                         'font': ('Segoe UI Semibold', 10), 'padding': 8}),
+        ('map', 'Danger.TButton', {'background': [('active', '#dc2626'), ('pressed', '#b91c1c')]}),
+        ('configure', 'Ghost.TButton', {'background': COLORS['card'], 'foreground': COLORS['muted'],
+                                        'font': ('Segoe UI', 9), 'padding': 6}),
+        ('map', 'Ghost.TButton', {'background': [('active', COLORS['bg'])],
+                                  'foreground': [('active', 'white')]}),
+        ('configure', 'Status.TLabel', {'background': COLORS['bg'], 'foreground': COLORS['muted'],
+                                        'font': ('Segoe UI', 10)}),
+        ('configure', 'Modern.Treeview', {'background': COLORS['card'], 'foreground': 'white',
+                                          'fieldbackground': COLORS['card'], 'bordercolor': COLORS['bg'],
+                                          'borderwidth': 0, 'rowheight': 32}),
+        ('configure', 'Modern.Treeview.Heading', {'background': COLORS['card'], 'foreground': COLORS['muted'],
+                                                  'borderwidth': 0, 'font': ('Segoe UI Semibold', 10)}),
+        ('map', 'Modern.Treeview', {'background': [('selected', '#334155')],
+                                    'foreground': [('selected', 'white')]}),
+    )
+
     def __init__(self) -> None:
         super().__init__()
         self.title('Įpročių studija')
         self.geometry('1100x720')
         self.minsize(980, 620)
 
-        self.colors = {
-            'bg': '#0f172a',
-            'card': '#1f2937',
-            'accent': '#38bdf8',
-            'muted': '#94a3b8',
-            'success': '#22c55e',
-            'danger': '#ef4444',
-        }
+        self.colors = self.COLORS
         self.configure(bg=self.colors['bg'])
 
         self.session = Session()
+        # Atidarom SQLite ryšį (ir pritaikom PRAGMA) iškart, o ne per pirmą vartotojo veiksmą.
+        self.session.connection()
         self.categories = [
             'Sportas', 'Mityba', 'Hobis', 'Skaitymas', 'Mokymasis', 'Meditacija', 'Poilsis'
         ]
         self.active_habit_id: Optional[int] = None
+        self._habit_cache: dict[int, Row] = {}
+        self._log_cache: dict[int, tuple[str, str]] = {}
         self.status_after: Optional[str] = None
+        self._quote_cache: deque[str] = deque(maxlen=QUOTE_CACHE_SIZE)
+        self._quote_loading = False
+        self._last_quote_fetch = 0.0
 
         self.category_var = tk.StringVar()
         self.desc_var = tk.StringVar()
@@ -94,40 +192,8 @@ class App(tk.Tk):
         except tk.TclError:
             pass
 
-        style.configure('App.TFrame', background=self.colors['bg'])
-        style.configure('Card.TFrame', background=self.colors['card'])
-        style.configure('Hero.TLabel', background=self.colors['card'], foreground='white',
-                        font=('Segoe UI', 24, 'bold'))
-        style.configure('HeroSub.TLabel', background=self.colors['card'], foreground=self.colors['muted'],
-                        font=('Segoe UI', 11))
-        style.configure('Quote.TLabel', background=self.colors['card'], foreground='#e2e8f0',
-                        font=('Segoe UI', 11, 'italic'), wraplength=720, justify='left')
-        style.configure('CardHeading.TLabel', background=self.colors['card'], foreground='white',
-                        font=('Segoe UI Semibold', 12))
-        style.configure('CardBody.TLabel', background=self.colors['card'], foreground=self.colors['muted'],
-                        font=('Segoe UI', 10))
-        style.configure('Primary.TButton', background=self.colors['accent'], foreground='#0f172a',
-                        font=('Segoe UI Semibold', 10), padding=8)
-        style.map('Primary.TButton',
-                  background=[('active', '#22d3ee'), ('pressed', '#0ea5e9')],
-                  foreground=[('pressed', '#0f172a')])
-        style.configure('Danger.TButton', background=self.colors['danger'], foreground='white',
-                        font=('Segoe UI Semibold', 10), padding=8)
-        style.map('Danger.TButton',
-                  background=[('active', '#dc2626'), ('pressed', '#b91c1c')])
-        style.configure('Ghost.TButton', background=self.colors['card'], foreground=self.colors['muted'],
-                        font=('Segoe UI', 9), padding=6)
-        style.map('Ghost.TButton', background=[('active', self.colors['bg'])],
-                  foreground=[('active', 'white')])
-        style.configure('Status.TLabel', background=self.colors['bg'], foreground=self.colors['muted'],
-                        font=('Segoe UI', 10))
-
-        style.configure('Modern.Treeview', background=self.colors['card'], foreground='white',
-                        fieldbackground=self.colors['card'], bordercolor=self.colors['bg'],
-                        borderwidth=0, rowheight=32)
-        style.configure('Modern.Treeview.Heading', background=self.colors['card'],
-                        foreground=self.colors['muted'], borderwidth=0, font=('Segoe UI Semibold', 10))
-        style.map('Modern.Treeview', background=[('selected', '#334155')], foreground=[('selected', 'white')])
+        for method, name, options in self._STYLE_SPEC:
+            getattr(style, method)(name, **options)
         style.layout('Modern.Treeview', [('Treeview.treearea', {'sticky': 'nswe'})])
 
     def build_layout(self) -> None:
@@ -287,32 +353,49 @@ class App(tk.Tk):
         self.desc_var.set('')
         self.note_var.set('')
         self.habit_tree.selection_remove(self.habit_tree.selection())
+        self._log_cache = {}
         self.log_tree.delete(*self.log_tree.get_children())
         self.logs_title_var.set('Žurnalas (0)')
 
+    @contextmanager
+    def _bulk(self) -> Iterator[None]:
+        """Sugrupuoja kelis pakeitimus į vieną transakciją (vienas commit pabaigoje)."""
+        try:
+            yield
+        except Exception:
+            self.session.rollback()
+            raise
+        self.session.commit()
+
+    @staticmethod
+    def fill_tree(tree: ttk.Treeview, items: list[tuple[str, tuple, tuple]]) -> None:
+        # Reikšmės suformuojamos iš anksto, cikle lieka tik Tcl insert kvietimai.
+        tree.delete(*tree.get_children())
+        insert = tree.insert
+        for iid, values, tags in items:
+            insert('', 'end', iid=iid, values=values, tags=tags)
+
     def get_active_habit(self) -> Optional[Habit]:
         if self.active_habit_id is None:
             return None
         return self.session.get(Habit, self.active_habit_id)
 
     def load_habits(self) -> None:
-        habits = self.session.query(Habit).order_by(Habit.created_at.desc()).all()
-        self.habit_tree.delete(*self.habit_tree.get_children())
-        categories = set(self.categories)
-
-        for habit in habits:
-            categories.add(habit.category)
-            self.habit_tree.insert(
-                '',
-                'end',
-                iid=str(habit.id),
-                values=(habit.category, habit.desc or 'Be aprašymo', habit.created_at.strftime('%Y-%m-%d')),
-            )
-
-        self.habit_cb['values'] = sorted(categories)
-        self.habits_title_var.set(f'Įpročiai ({len(habits)})')
-
-        if self.active_habit_id and str(self.active_habit_id) in self.habit_tree.get_children():
+        # Lentelei užtenka stulpelių reikšmių – ORM objektų nekuriame.
+        rows = self.session.execute(
+            select(Habit.id, Habit.category, Habit.desc, Habit.created_at)
+            .order_by(Habit.created_at.desc())
+        ).all()
+        self._habit_cache = {row.id: row for row in rows}
+        self.fill_tree(self.habit_tree, [
+            (str(habit_id), (category, desc or 'Be aprašymo', created_at.strftime('%Y-%m-%d')), ())
+            for habit_id, category, desc, created_at in rows
+        ])
+
+        self.habit_cb['values'] = sorted(set(self.categories).union(row.category for row in rows))
+        self.habits_title_var.set(f'Įpročiai ({len(rows)})')
+
+        if self.active_habit_id and self.active_habit_id in self._habit_cache:
             self.habit_tree.selection_set(str(self.active_habit_id))
             self.habit_tree.see(str(self.active_habit_id))
         else:
@@ -326,7 +409,7 @@ class App(tk.Tk):
             return
 
         habit_id = int(selection[0])
-        habit = self.session.get(Habit, habit_id)
+        habit = self._habit_cache.get(habit_id)
         if not habit:
             self.reset_form()
             return
@@ -334,41 +417,42 @@ class App(tk.Tk):
         self.active_habit_id = habit.id
         self.category_var.set(habit.category)
         self.desc_var.set(habit.desc)
-        self.load_logs(habit)
+        self.load_logs(habit.id)
 
-    def load_logs(self, habit: Optional[Habit] = None) -> None:
-        habit = habit or self.get_active_habit()
-        self.log_tree.delete(*self.log_tree.get_children())
+    def load_logs(self, habit_id: Optional[int] = None) -> None:
+        habit_id = habit_id or self.active_habit_id
 
-        if not habit:
+        if not habit_id:
+            self._log_cache = {}
+            self.log_tree.delete(*self.log_tree.get_children())
             self.logs_title_var.set('Žurnalas (0)')
             return
 
-        logs = sorted(habit.logs, key=lambda lg: lg.date, reverse=True)
-        for log in logs:
-            tag = 'done' if log.status == 'padaryta' else 'missed'
-            self.log_tree.insert(
-                '',
-                'end',
-                iid=str(log.id),
-                values=(
-                    log.date.strftime('%Y-%m-%d'),
-                    log.status.capitalize(),
-                    log.note or 'Be pastabos',
-                ),
-                tags=(tag,),
+        rows = self.session.execute(
+            select(Log.id, Log.date, Log.status, Log.note)
+            .where(Log.habit_id == habit_id)
+            .order_by(Log.date.desc())
+        ).all()
+        self._log_cache = {log_id: (status, note) for log_id, _, status, note in rows}
+        self.fill_tree(self.log_tree, [
+            (
+                str(log_id),
+                (log_date.strftime('%Y-%m-%d'), status.capitalize(), note or 'Be pastabos'),
+                ('done' if status == 'padaryta' else 'missed',),
             )
-        self.logs_title_var.set(f'Žurnalas ({len(logs)})')
+            for log_id, log_date, status, note in rows
+        ])
+        self.logs_title_var.set(f'Žurnalas ({len(rows)})')
 
     def on_log_select(self) -> None:
         selection = self.log_tree.selection()
         if not selection:
             return
-        log_id = int(selection[0])
-        log = self.session.get(Log, log_id)
-        if log:
-            self.status_field.set(log.status)
-            self.note_var.set(log.note)
+        cached = self._log_cache.get(int(selection[0]))
+        if cached:
+            status, note = cached
+            self.status_field.set(status)
+            self.note_var.set(note)
 
     def save_habit(self) -> None:
         category = self.category_var.get().strip()
@@ -392,7 +476,7 @@ class App(tk.Tk):
         self.session.commit()
         self.active_habit_id = habit.id
         self.load_habits()
-        self.load_logs(habit)
+        self.load_logs(habit.id)
         self.show_status('Įprotis išsaugotas.', 'success')
 
     def delete_habit(self) -> None:
@@ -402,6 +486,8 @@ class App(tk.Tk):
             return
         if not messagebox.askyesno('Patvirtinimas', f'Ištrinti „{habit.category}“ ir visus įrašus?'):
             return
+        # Kolekcija galėjo pasenti (pvz. po bulk_add_logs), todėl kaskadai ją perkraunam.
+        self.session.expire(habit, ['logs'])
         self.session.delete(habit)
         self.session.commit()
         self.reset_form()
@@ -420,9 +506,19 @@ class App(tk.Tk):
         self.session.add(log)
         self.session.commit()
         self.note_var.set('')
-        self.load_logs(habit)
+        self.load_logs(habit.id)
         self.show_status('Pažanga užfiksuota.', 'success')
 
+    def bulk_add_logs(self, habit_id: int, rows: Iterable[dict]) -> None:
+        """Įrašo daug žurnalo eilučių vienu Core INSERT (be ORM flush), pvz. kelių dienų žymėjimui."""
+        payload = [{'date': date.today(), 'note': '', **row, 'habit_id': habit_id} for row in rows]
+        if not payload:
+            return
+        with self._bulk():
+            self.session.execute(insert(Log), payload)
+        if habit_id == self.active_habit_id:
+            self.load_logs(habit_id)
+
     def delete_log(self) -> None:
         selection = self.log_tree.selection()
         if not selection:
@@ -433,25 +529,56 @@ class App(tk.Tk):
             return
         if not messagebox.askyesno('Patvirtinimas', 'Ar tikrai pašalinti šį įrašą?'):
             return
-        habit = log.habit
+        habit_id = log.habit_id
+        # habit.logs neužkraunama – tik pažymima pasenusi, kad neliktų ištrinto įrašo.
+        if log.habit is not None:
+            self.session.expire(log.habit, ['logs'])
         self.session.delete(log)
         self.session.commit()
-        self.load_logs(habit)
+        self.load_logs(habit_id)
         self.show_status('Įrašas pašalintas.', 'danger')
 
     def fetch_quote(self) -> None:
+        if self._quote_loading:
+            return
+        recent = time.monotonic() - self._last_quote_fetch < QUOTE_REUSE_SECONDS
+        if recent and len(self._quote_cache) >= QUOTE_REUSE_MIN:
+            # Dažni paspaudimai – sukame jau turimas citatas be tinklo užklausos.
+            quote = self._quote_cache.popleft()
+            self._quote_cache.append(quote)
+            self.quote_var.set(quote)
+            return
+
+        self._quote_loading = True
         self.quote_var.set('Kraunama citata...')
+        threading.Thread(target=self._bg_fetch_quote, daemon=True).start()
+
+    def _bg_fetch_quote(self) -> None:
         try:
-            resp = requests.get('https://quotes.toscrape.com/random', timeout=5)
+            resp = requests.get(QUOTE_URL, timeout=5)
             resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            text = soup.find('span', class_='text').get_text(strip=True)
-            author = soup.find('small', class_='author').get_text(strip=True)
-            self.quote_var.set(f'{text} — {author}')
-            self.show_status('Nauja citata paruošta.', 'info')
+            match = QUOTE_RE.search(resp.text)
+            text, author = (html.unescape(part).strip() for part in match.groups())
         except Exception:
+            self.after(0, self._quote_failed)
+            return
+        self.after(0, self._apply_quote, f'{text} — {author}')
+
+    def _apply_quote(self, quote: str) -> None:
+        self._quote_loading = False
+        self._last_quote_fetch = time.monotonic()
+        self._quote_cache.append(quote)
+        self.quote_var.set(quote)
+        self.show_status('Nauja citata paruošta.', 'info')
+
+    def _quote_failed(self) -> None:
+        self._quote_loading = False
+        if self._quote_cache:
+            self._quote_cache.rotate(-1)
+            self.quote_var.set(self._quote_cache[-1])
+        else:
             self.quote_var.set('Nepavyko gauti citatos. Bandykite vėliau.')
-            self.show_status('Citata nepasiekiama.', 'danger')
+        self.show_status('Citata nepasiekiama.', 'danger')
 
     def show_status(self, message: str, level: str = 'info') -> None:
         palette = {
@@ -1,8 +1,21 @@
+import numpy as np
 import pandas as pd
 import re
 import argparse
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401  # type: ignore
+    HAS_PYARROW = True
+except Exception:  # pragma: no cover
+    HAS_PYARROW = False
+
+
+# Paskutinis tokenas (skiriant tarpais ir '/'), turintis bent vieną skaičių,
+# 4+ simbolių ir sudarytas tik iš raidžių / skaičių / brūkšnelių
+CODE_RE = re.compile(r"^.*(?<![^\s/])((?=[A-Za-z0-9-]*\d)[A-Za-z0-9-]{4,})(?![^\s/])", re.DOTALL)
+_is_code_token = re.compile(r"(?=[A-Za-z0-9-]*\d)[A-Za-z0-9-]+").fullmatch
+
 
 def extract_code(name: str) -> str | None:
     """
@@ -11,25 +24,34 @@ def extract_code(name: str) -> str | None:
     - skiria pagal tarpus ir '/'
     - ima tokenus nuo galo
     - ieško tokių, kurie turi bent vieną skaičių ir yra 4+ simbolių
+
+    Visam stulpeliui naudok `Series.str.extract(CODE_RE, expand=False)`.
     """
     if not isinstance(name, str):
         return None
 
-    tokens = name.replace("/", " ").split()
-    for tok in reversed(tokens):
-        tok_clean = tok.strip()
-        # Bent vienas skaičius ir bent 4 simboliai, tik raidės / skaičiai / brūkšneliai
-        if (
-            len(tok_clean) >= 4
-            and any(ch.isdigit() for ch in tok_clean)
-            and re.fullmatch(r"[A-Z0-9\-]+", tok_clean, flags=re.IGNORECASE)
-        ):
-            return tok_clean
-    return None
+    # Einam nuo galo po vieną tokeną – dažniausiai kodas yra paskutinis
+    rest = name.replace("/", " ")
+    while True:
+        parts = rest.rsplit(None, 1)
+        if not parts:
+            return None
+        tok = parts[-1]
+        if len(tok) >= 4 and _is_code_token(tok):
+            return tok
+        if len(parts) == 1:
+            return None
+        rest = parts[0]
 
 
 def load_wc_export(path: Path) -> pd.DataFrame:
-    """Nuskaito wc-product-export CSV."""
+    """
+    Nuskaito wc-product-export CSV.
+    Jei įdiegtas pyarrow – naudojam daugiagijį pyarrow parserį (dtypes lieka numpy,
+    nes vėliau į tuos pačius stulpelius rašom tekstą).
+    """
+    if HAS_PYARROW:
+        return pd.read_csv(path, encoding="utf-8-sig", engine="pyarrow")
     df = pd.read_csv(path, encoding="utf-8-sig")
     return df
 
@@ -38,6 +60,9 @@ def load_stock_file(path: Path) -> pd.DataFrame:
     """
     Nuskaito 'Prekių likučiai...' CSV ir padaro minimalų tvarkymą:
     - numeta pirmas 3 eilutes (antraštės ir tuščia info)
+
+    Čia liekam prie C parserio: failo pradžia nelygi, o kodas remiasi
+    pandas sugeneruotais 'Unnamed: N' stulpelių pavadinimais.
     """
     df_raw = pd.read_csv(path, encoding="utf-8-sig")
     # Pagal tavo failą – realūs duomenys prasideda nuo 4 eilutės (indeksas 3)
@@ -52,67 +77,55 @@ def normalize_stock_to_wc_structure(stock_df: pd.DataFrame, wc_cols: list[str])
 
     Tikslas: gauti "wc-formato" eilutes likučių duomenims.
     """
-    df = pd.DataFrame(columns=wc_cols)
-
     # Pavadinimas – pilnas tekstas iš 'Likučiai 2023.12.31'
     if "Likučiai 2023.12.31" not in stock_df.columns:
         raise ValueError("Laukų 'Likučiai 2023.12.31' nerasta likučių faile.")
 
-    df["Pavadinimas"] = stock_df["Likučiai 2023.12.31"].astype(str)
+    # Stulpelius surenkam į dict ir DataFrame kuriam vieną kartą
+    data: dict[str, object] = {}
+    names = stock_df["Likučiai 2023.12.31"].astype(str)
+    data["Pavadinimas"] = names
 
     # Prekės kodas – ištraukiamas iš pavadinimo
-    df["Prekės kodas"] = stock_df["Likučiai 2023.12.31"].apply(extract_code)
+    data["Prekės kodas"] = names.str.extract(CODE_RE, expand=False)
 
     # Atsargos (kiekis) – iš Unnamed: 2 (ten pas tave 'Kiekis')
     if "Unnamed: 2" in stock_df.columns:
-        df["Atsargos"] = pd.to_numeric(stock_df["Unnamed: 2"], errors="coerce")
+        atsargos = pd.to_numeric(stock_df["Unnamed: 2"], errors="coerce")
     else:
-        df["Atsargos"] = pd.NA
+        atsargos = pd.Series(np.nan, index=stock_df.index)
+    data["Atsargos"] = atsargos
 
     # Reguliari kaina – iš Unnamed: 1 (pirkimo kaina)
     if "Unnamed: 1" in stock_df.columns:
         # jei būtų kableliai kaip dešimtainiai – galima būtų daryti .str.replace(",", ".")
-        df["Reguliari kaina"] = pd.to_numeric(stock_df["Unnamed: 1"], errors="coerce")
+        data["Reguliari kaina"] = pd.to_numeric(stock_df["Unnamed: 1"], errors="coerce")
     else:
-        df["Reguliari kaina"] = pd.NA
+        data["Reguliari kaina"] = pd.NA
 
     # Pirkimo pastaba – kad neprarast info apie pirkimą ir sumą
     note_parts = []
     if "Unnamed: 1" in stock_df.columns:
-        note_parts.append("Pirkimo kaina: " + stock_df["Unnamed: 1"].astype(str).fillna(""))
+        note_parts.append("Pirkimo kaina: " + stock_df["Unnamed: 1"].fillna("").astype(str))
     if "Unnamed: 3" in stock_df.columns:
-        note_parts.append("Suma: " + stock_df["Unnamed: 3"].astype(str).fillna(""))
+        note_parts.append("Suma: " + stock_df["Unnamed: 3"].fillna("").astype(str))
 
     if note_parts:
-        df["Pirkimo pastaba"] = ", ".join(note_parts)
+        # Sujungiam kiekvienai eilutei atskirai, o ne visus stulpelius į vieną tekstą
+        data["Pirkimo pastaba"] = note_parts[0].str.cat(note_parts[1:], sep=", ")
     else:
-        df["Pirkimo pastaba"] = ""
+        data["Pirkimo pastaba"] = ""
 
     # Tipas – pagal nutylėjimą 'simple'
-    df["Tipas"] = "simple"
+    data["Tipas"] = "simple"
 
     # Turime? – jei atsargos > 0, tada '1'
-    def flag_in_stock(x):
-        try:
-            return "1" if pd.notna(x) and float(x) > 0 else ""
-        except Exception:
-            return ""
-
-    df["Turime?"] = df["Atsargos"].apply(flag_in_stock)
+    data["Turime?"] = np.where(atsargos.fillna(0) > 0, "1", "")
 
-    # Paskelbtas – paliekam tuščią (galėsi nuspręsti, ar naujas prekes skelbti)
-    if "Paskelbtas" in df.columns:
-        df["Paskelbtas"] = df.get("Paskelbtas", "")
+    df = pd.DataFrame(data, index=stock_df.index)
 
-    # Užpildom visus kitus trūkstamus stulpelius tuščiomis reikšmėmis, kad struktūra sutaptų
-    for col in wc_cols:
-        if col not in df.columns:
-            df[col] = ""
-
-    # Sulygiuojam stulpelių tvarką su wc export
-    df = df[wc_cols]
-
-    return df
+    # Sulygiuojam stulpelių tvarką su wc export, trūkstamus (pvz. Paskelbtas) paliekam tuščius
+    return df.reindex(columns=wc_cols, fill_value="")
 
 
 def merge_wc_and_stock(
@@ -134,49 +147,48 @@ def merge_wc_and_stock(
     if "Prekės kodas" not in wc_df.columns:
         raise ValueError("wc-product-export faile nėra stulpelio 'Prekės kodas'.")
 
-    # Kad būtų lengviau ieškoti pagal kodą, padarom indeksą wc faile pagal Prekės kodą (neprivaloma, bet patogu)
-    # NE: indeksą daryt nenaudosim, nes kodai gali kartotis; geriau naudosim boolean mask
     wc_cols = list(wc_df.columns)
 
-    # Suvedam visus kodus iš likučių
-    for _, stock_row in stock_wc_df.iterrows():
-        code = stock_row.get("Prekės kodas", None)
-        if pd.isna(code) or code == "":
-            # jei neturi kodo – kol kas praleidžiam arba ateityje galima daryti match per pavadinimą
-            continue
-
-        mask = wc_df["Prekės kodas"] == code
-
-        if mask.any():
-            # Prekė jau yra wc – atnaujinam
-            idx = wc_df.index[mask][0]
-
-            if prefer_stock_quantity:
-                wc_df.at[idx, "Atsargos"] = stock_row.get("Atsargos", wc_df.at[idx, "Atsargos"])
-
-            # Jei nori – galim atnaujinti ir Reguliari kaina (tik jei likučių faile ji egzistuoja)
-            if not pd.isna(stock_row.get("Reguliari kaina", pd.NA)):
-                wc_df.at[idx, "Reguliari kaina"] = stock_row["Reguliari kaina"]
-
-            # Pirkimo pastaba – prirašom arba perrašom
-            note = stock_row.get("Pirkimo pastaba", "")
-            if isinstance(note, str) and note.strip():
-                wc_df.at[idx, "Pirkimo pastaba"] = note
-
-            # Turime? – pagal atsargas
-            qty = stock_row.get("Atsargos", None)
-            try:
-                wc_df.at[idx, "Turime?"] = "1" if pd.notna(qty) and float(qty) > 0 else ""
-            except Exception:
-                pass
-
-        else:
-            # Prekės nėra wc – pridedam ją kaip naują
-            new_row = {col: "" for col in wc_cols}
-            for col in wc_cols:
-                if col in stock_row.index:
-                    new_row[col] = stock_row[col]
-            wc_df = pd.concat([wc_df, pd.DataFrame([new_row])], ignore_index=True)
+    if "Prekės kodas" not in stock_wc_df.columns:
+        return wc_df
+
+    # Eilutes be kodo kol kas praleidžiam (ateityje galima daryti match per pavadinimą)
+    stock_codes = stock_wc_df["Prekės kodas"]
+    stock_wc_df = stock_wc_df[stock_codes.notna() & (stock_codes != "")]
+    # Jei kodas likučiuose kartojasi – galioja paskutinė eilutė
+    stock_index = stock_wc_df.drop_duplicates("Prekės kodas", keep="last").set_index("Prekės kodas")
+
+    # Kodai wc faile gali kartotis, todėl atnaujinam tik pirmą eilutę su tuo kodu
+    wc_codes = wc_df["Prekės kodas"]
+    mask = wc_codes.isin(stock_index.index) & ~wc_codes.duplicated()
+    matched_codes = wc_codes[mask]
+
+    if prefer_stock_quantity and "Atsargos" in stock_index.columns:
+        wc_df.loc[mask, "Atsargos"] = matched_codes.map(stock_index["Atsargos"])
+
+    # Reguliari kaina – tik jei likučių faile ji egzistuoja
+    if "Reguliari kaina" in stock_index.columns:
+        prices = matched_codes.map(stock_index["Reguliari kaina"]).dropna()
+        wc_df.loc[prices.index, "Reguliari kaina"] = prices
+
+    # Pirkimo pastaba – perrašom, jei likučiuose ji netuščia
+    if "Pirkimo pastaba" in stock_index.columns:
+        notes = matched_codes.map(stock_index["Pirkimo pastaba"]).astype(object)
+        notes = notes[notes.str.strip().fillna("").ne("")]
+        wc_df.loc[notes.index, "Pirkimo pastaba"] = notes
+
+    # Turime? – pagal likučių atsargas
+    if "Atsargos" in stock_index.columns:
+        qty = pd.to_numeric(matched_codes.map(stock_index["Atsargos"]), errors="coerce").fillna(0)
+        wc_df.loc[mask, "Turime?"] = np.where(qty > 0, "1", "")
+    else:
+        wc_df.loc[mask, "Turime?"] = ""
+
+    # Prekių, kurių nėra wc, pridedam vienu kartu
+    new_rows = stock_index.loc[~stock_index.index.isin(wc_codes)].reset_index()
+    if not new_rows.empty:
+        new_rows = new_rows.reindex(columns=wc_cols, fill_value="")
+        wc_df = pd.concat([wc_df, new_rows], ignore_index=True)
 
     return wc_df
 
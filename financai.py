@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import json
 import csv
+import re
+import zipfile
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
 from datetime import datetime, timedelta, date
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Sequence
 from uuid import uuid4
-from calendar import monthrange
+from calendar import isleap
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
@@ -18,7 +24,126 @@ try:
 except ImportError:  # pragma: no cover - optional priklausomybe
     openpyxl = None
 
-DATA_FILE = Path(__file__).with_name("finance_data.json")
+try:
+    import python_calamine
+except ImportError:  # pragma: no cover - optional priklausomybe
+    python_calamine = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional priklausomybe
+    np = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional priklausomybe
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: object) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# Vienas irasas – viena JSON eilute, kad naujus irasus butu galima prirasyti gale.
+DATA_FILE = Path(__file__).with_name("finance_data.jsonl")
+LEGACY_DATA_FILE = Path(__file__).with_name("finance_data.json")
+
+# Visos importo datu formos (%Y-%m-%d, %Y.%m.%d, %Y/%m/%d, %d.%m.%Y, %m/%d/%Y) vienu sablonu be strptime.
+_DATE_RE = re.compile(
+    r"(?P<y1>[0-9]{4})(?P<sep>[-./])(?P<m1>[0-9]{1,2})(?P=sep)(?P<d1>[0-9]{1,2})"
+    r"|(?P<d2>[0-9]{1,2})\.(?P<m2>[0-9]{1,2})\.(?P<y2>[0-9]{4})"
+    r"|(?P<m3>[0-9]{1,2})/(?P<d3>[0-9]{1,2})/(?P<y3>[0-9]{4})"
+)
+
+_HEADER_TRANSLATION = str.maketrans(
+    "\u0105\u010d\u0119\u0117\u012f\u0161\u0173\u016b\u017e\u0104\u010c\u0118\u0116\u012e\u0160\u0172\u016a\u017d",
+    "aceeisuuzACEEISUUZ",
+)
+# Viskas, kas nera raide ar skaitmuo (kaip str.isalnum).
+_HEADER_STRIP_RE = re.compile(r"[\W_]+")
+
+# Sumos forma, kuria priima _parse_amount (pvz. "-12,50 EUR"); naudojama stulpeliu tikrinimui be isimciu.
+_AMOUNT_RE = re.compile(r"(?:EUR)?\s*[+-]?(?:[0-9]+(?:[.,][0-9]*)?|[.,][0-9]+)\s*(?:EUR)?")
+
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+# Aktyvus xlsx lapas (tas pats, kuri grazina openpyxl workbook.active) is xl/workbook.xml.
+_ACTIVE_TAB_RE = re.compile(rb"<(?:\w+:)?workbookView\b[^>]*?\bactiveTab=\"(\d+)\"")
+
+_MONTH_ABBR = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_in_month(year: int, month: int) -> int:
+    return _DAYS_IN_MONTH[month - 1] + (1 if month == 2 and isleap(year) else 0)
+
+
+def _valid_iso(text: str) -> bool:
+    """Greitas YYYY-MM-DD patikrinimas pjuviais, be strptime."""
+    if len(text) != 10 or text[4] != "-" or text[7] != "-" or not text.isascii():
+        return False
+    year, month, day = text[:4], text[5:7], text[8:]
+    if not (year.isdigit() and month.isdigit() and day.isdigit()):
+        return False
+    year_num, month_num = int(year), int(month)
+    return year_num >= 1 and 1 <= month_num <= 12 and 1 <= int(day) <= _days_in_month(year_num, month_num)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_text(text: str) -> date | None:
+    match = _DATE_RE.fullmatch(text)
+    if match:
+        year, month, day = (
+            (match["y1"], match["m1"], match["d1"])
+            if match["y1"]
+            else (match["y2"], match["m2"], match["d2"])
+            if match["y2"]
+            else (match["y3"], match["m3"], match["d3"])
+        )
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            return None
+    # Pvz. ne ASCII skaitmenys - juos vis dar priima strptime.
+    for fmt in ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%d.%m.%Y", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _row_is_blank(row: Sequence[object]) -> bool:
+    """Tas pats kaip visi _stringify(cell) tusti: tik None ir tarpu eilutes laikomos tusciomis."""
+    return not any(cell.strip() if isinstance(cell, str) else cell is not None for cell in row)
+
+
+def _layout_bars(amounts, start_x, bar_width, spacing, zero_y, scale, above):
+    """Stulpeliu geometrija: (x0, y0, x1, y1, label_y) kiekvienai sumai."""
+    layout = []
+    x = start_x
+    for amount in amounts:
+        height = amount * scale
+        top = zero_y - height if above else zero_y
+        bottom = zero_y if above else zero_y + height
+        label_y = top - 10.0 if above else bottom + 10.0
+        layout.append((x, top, x + bar_width, bottom, label_y))
+        x += bar_width + spacing
+    return layout
+
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional priklausomybe
+    numba = None
+else:
+    _layout_bars = numba.njit(cache=True)(_layout_bars)
 
 SPECIAL_BUDGET_COLUMNS = {
     "alga": {
@@ -58,9 +183,28 @@ SPECIAL_BUDGET_COLUMNS = {
         "description": "Likutis po islaidu",
     },
 }
+ALIAS_TO_KEY = {alias: key for key, spec in SPECIAL_BUDGET_COLUMNS.items() for alias in spec["aliases"]}
+
+
+@lru_cache(maxsize=8192)
+def _format_currency(value: float) -> str:
+    formatted = f"{value:,.2f}"
+    integer, _, decimals = formatted.partition(".")
+    integer = integer.replace(",", " ")
+    return f"{integer},{decimals} EUR"
+
+
+@lru_cache(maxsize=4096)
+def _parse_amount_text(text: str) -> float:
+    cleaned = text.replace("EUR", "").replace(",", ".").strip()
+    return float(cleaned)
+
+
+class ImportReadError(RuntimeError):
+    """Failo skaitymo klaida, ivykusi jau skaitant eilutes srautu."""
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     uid: str
     date: str
@@ -68,6 +212,11 @@ class Transaction:
     description: str
     amount: float
     kind: str  # "income" arba "expense"
+    # "YYYY-MM" – date jau ISO formato, todel uztenka pjuvio; atnaujinti keiciant date
+    month_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.month_key = self.date[:7]
 
     @staticmethod
     def from_dict(data: dict) -> "Transaction":
@@ -82,13 +231,10 @@ class Transaction:
 
     def to_dict(self) -> dict:
         payload = asdict(self)
+        del payload["month_key"]
         payload["amount"] = round(self.amount, 2)
         return payload
 
-    @property
-    def month_key(self) -> str:
-        return datetime.fromisoformat(self.date).strftime("%Y-%m")
-
 
 class FinanceTracker(ttk.Frame):
     def __init__(self, master: tk.Tk):
@@ -147,8 +293,21 @@ class FinanceTracker(ttk.Frame):
         self.avg_income_var = tk.StringVar(value=self.format_currency(0))
         self.avg_expense_var = tk.StringVar(value=self.format_currency(0))
 
+        # Irasai laikomi surikiuoti pagal data (didejimo tvarka); _dates - lygiagretus datu sarasas paieskai.
         self.transactions: List[Transaction] = []
+        self._dates: List[str] = []
+        self._by_uid: dict[str, Transaction] = {}
         self.editing_uid: str | None = None
+        self._np_cache: tuple | None = None
+        # Menesiu sumos ir irasai grafikui; isvalomi tik pasikeitus irasams, ne perpiesiant.
+        self._agg_cache: tuple | None = None
+        # Rasymas i disk atidedamas: kaupiami nauji irasai arba pazymima, kad reikia perrasyti viska.
+        self._pending_append: List[Transaction] = []
+        self._needs_rewrite = False
+        self._save_after_id: str | None = None
+        self._batch_depth = 0
+        self._chart_job: str | None = None
+        master.protocol("WM_DELETE_WINDOW", self._flush_and_close)
 
         self._build_layout()
         self.load_transactions()
@@ -328,40 +487,127 @@ class FinanceTracker(ttk.Frame):
             highlightthickness=0,
         )
         self.chart_canvas.grid(column=0, row=0, sticky="nsew")
-        self.chart_canvas.bind("<Configure>", lambda event: self.update_chart())
+        self.chart_canvas.bind("<Configure>", self._on_chart_configure)
+
+    def _on_chart_configure(self, _event: tk.Event) -> None:
+        # Keiciant lango dydi ivykiu ateina daug - perpiesiama tik kai jie nurimsta.
+        if self._chart_job is not None:
+            self.after_cancel(self._chart_job)
+        self._chart_job = self.after(50, self._redraw_chart)
+
+    def _redraw_chart(self) -> None:
+        self._chart_job = None
+        self.update_chart()
 
     @staticmethod
     def format_currency(value: float) -> str:
-        formatted = f"{value:,.2f}"
-        integer, _, decimals = formatted.partition(".")
-        integer = integer.replace(",", " ")
-        return f"{integer},{decimals} EUR"
+        return _format_currency(round(value, 2))
 
     def load_transactions(self) -> None:
-        if not DATA_FILE.exists():
-            self.transactions = []
-            return
+        self._invalidate_aggregates()
         try:
-            raw = json.loads(DATA_FILE.read_text(encoding="utf-8"))
+            if DATA_FILE.exists():
+                lines = DATA_FILE.read_bytes().splitlines()
+                raw = [_json_loads(line) for line in lines if line.strip()]
+            elif LEGACY_DATA_FILE.exists():
+                raw = _json_loads(LEGACY_DATA_FILE.read_bytes())
+            else:
+                raw = []
             self.transactions = [Transaction.from_dict(item) for item in raw]
+            self._sort_transactions()
         except Exception as exc:  # pragma: no cover
             messagebox.showwarning(
                 "Ispejimas",
                 f"Nepavyko nuskaityti esamu duomenu. Pradedama nuo tuscio saraso.\n{exc}",
             )
             self.transactions = []
+            self._dates = []
+            self._by_uid = {}
+
+    def _sort_transactions(self) -> None:
+        # Stabilus rikiavimas: tos pacios datos irasai islaiko pridejimo tvarka.
+        self.transactions.sort(key=lambda tx: tx.date)
+        self._dates = [txn.date for txn in self.transactions]
+        self._by_uid = {txn.uid: txn for txn in self.transactions}
+
+    def _insert_transaction(self, txn: Transaction) -> int:
+        # uz tos pacios datos irasu, kaip po perkrovimo (stabilus rikiavimas pagal failo tvarka)
+        idx = bisect_right(self._dates, txn.date)
+        self._dates.insert(idx, txn.date)
+        self.transactions.insert(idx, txn)
+        self._by_uid[txn.uid] = txn
+        return idx
+
+    def _index_of(self, txn: Transaction) -> int:
+        lo = bisect_left(self._dates, txn.date)
+        hi = bisect_right(self._dates, txn.date, lo)
+        return next(i for i in range(lo, hi) if self.transactions[i] is txn)
+
+    @staticmethod
+    def _encode_line(txn: Transaction) -> bytes:
+        return _json_dumps(txn.to_dict()) + b"\n"
+
+    def _append_transactions(self, txns: List[Transaction]) -> None:
+        """Pazymi naujus irasus prirasymui failo gale (irasoma atidetai)."""
+        self._invalidate_aggregates()
+        self._pending_append.extend(txns)
+        self._schedule_save()
+
+    def _rewrite_all(self) -> None:
+        """Pazymi, kad faila reikia perrasyti visa – tik redaguojant ar trinant."""
+        self._invalidate_aggregates()
+        self._needs_rewrite = True
+        self._pending_append.clear()
+        self._schedule_save()
+
+    @contextmanager
+    def _batch_save(self) -> Iterator[None]:
+        """Bloko viduje pakeitimai tik kaupiami; isejus is bloko irasoma viena karta."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_if_dirty()
+
+    def _schedule_save(self) -> None:
+        if self._batch_depth:
+            return
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+        self._save_after_id = self.after(500, self._flush_if_dirty)
+
+    def _flush_if_dirty(self) -> None:
+        if self._save_after_id is not None:
+            self.after_cancel(self._save_after_id)
+            self._save_after_id = None
+        if not (self._needs_rewrite or self._pending_append):
+            return
+        if self._needs_rewrite or not DATA_FILE.exists():
+            # Jei .jsonl dar nera (pvz. duomenys is seno .json), pirmas rasymas sukuria pilna faila.
+            DATA_FILE.write_bytes(b"".join(self._encode_line(txn) for txn in self.transactions))
+        else:
+            with DATA_FILE.open("ab") as file:
+                file.writelines(self._encode_line(txn) for txn in self._pending_append)
+        self._needs_rewrite = False
+        self._pending_append.clear()
 
-    def save_transactions(self) -> None:
-        data = [txn.to_dict() for txn in self.transactions]
-        DATA_FILE.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    def _flush_and_close(self) -> None:
+        self._flush_if_dirty()
+        self.master.destroy()
 
     def add_transaction(self) -> None:
         date_raw = self.date_var.get().strip()
-        try:
-            date_value = datetime.strptime(date_raw, "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Netinkama data", "Data turi buti formatu YYYY-MM-DD.")
-            return
+        if _valid_iso(date_raw):
+            date_text = date_raw
+        else:
+            # strptime priima ir nenulines dienas/menesius (pvz. 2024-3-5), todel paliekamas atsarginiam keliui.
+            try:
+                date_text = datetime.strptime(date_raw, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                messagebox.showerror("Netinkama data", "Data turi buti formatu YYYY-MM-DD.")
+                return
 
         try:
             amount = float(self.amount_var.get().replace(",", "."))
@@ -380,28 +626,36 @@ class FinanceTracker(ttk.Frame):
         )
 
         if self.editing_uid:
-            target = next((item for item in self.transactions if item.uid == self.editing_uid), None)
+            target = self._by_uid.get(self.editing_uid)
             if not target:
                 messagebox.showerror("Redagavimas", "Nepavyko atnaujinti pasirinkto iraso.")
             else:
-                target.date = date_value.strftime("%Y-%m-%d")
+                old_index = self._index_of(target)
+                target.date = date_text
+                target.month_key = target.date[:7]
                 target.category = category
                 target.description = description
                 target.amount = round(amount, 2)
                 target.kind = kind
+                self._update_row(target, old_index)
         else:
             txn = Transaction(
                 uid=uuid4().hex,
-                date=date_value.strftime("%Y-%m-%d"),
+                date=date_text,
                 category=category,
                 description=description,
                 amount=round(amount, 2),
                 kind=kind,
             )
-            self.transactions.append(txn)
-        self.save_transactions()
+            self._insert_row(txn, self._insert_transaction(txn))
+        if self.editing_uid:
+            self._rewrite_all()
+        else:
+            self._append_transactions([txn])
         self.clear_form()
-        self.refresh_all()
+        self._update_table_status()
+        self.update_summary()
+        self.update_chart()
 
     def clear_form(self) -> None:
         self.amount_var.set("")
@@ -417,65 +671,126 @@ class FinanceTracker(ttk.Frame):
         self.refresh_table()
         self.update_chart()
 
-    def refresh_table(self) -> None:
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        sorted_txns = sorted(self.transactions, key=lambda tx: tx.date, reverse=True)
-        for txn in sorted_txns:
-            pretty_kind = "Pajamos" if txn.kind == "income" else "Islaidos"
-            amount_text = ("+" if txn.kind == "income" else "-") + self.format_currency(txn.amount)
-            self.tree.insert(
-                "",
-                "end",
-                iid=txn.uid,
-                values=(txn.date, pretty_kind, txn.category, txn.description, amount_text),
-                tags=(txn.kind,),
-            )
-        self.tree.tag_configure("income", foreground="#4ade80")
-        self.tree.tag_configure("expense", foreground="#fb7185")
-        self.table_status_var.set(f"Rodoma {len(sorted_txns)} irasu")
-        if sorted_txns:
+    def _row_values(self, txn: Transaction) -> tuple:
+        pretty_kind = "Pajamos" if txn.kind == "income" else "Islaidos"
+        amount_text = ("+" if txn.kind == "income" else "-") + self.format_currency(txn.amount)
+        return (txn.date, pretty_kind, txn.category, txn.description, amount_text)
+
+    def _insert_row(self, txn: Transaction, idx: int) -> None:
+        # Lentele rodo self.transactions atvirkstine tvarka.
+        position = len(self.transactions) - 1 - idx
+        self.tree.insert("", position, iid=txn.uid, values=self._row_values(txn), tags=(txn.kind,))
+
+    def _update_row(self, txn: Transaction, old_index: int) -> None:
+        if txn.date == self._dates[old_index]:
+            self.tree.item(txn.uid, values=self._row_values(txn), tags=(txn.kind,))
+            return
+        del self._dates[old_index]
+        del self.transactions[old_index]
+        self.tree.delete(txn.uid)
+        self._insert_row(txn, self._insert_transaction(txn))
+
+    def _update_table_status(self) -> None:
+        count = len(self.transactions)
+        self.table_status_var.set(f"Rodoma {count} irasu")
+        if count:
             self.empty_table_label.place_forget()
         else:
             self.empty_table_label.place(relx=0.5, rely=0.45, anchor="center")
 
+    def refresh_table(self) -> None:
+        """Pilnas lenteles perpiesimas; iprastiems pakeitimams naudojami _insert_row/_update_row."""
+        self.tree.delete(*self.tree.get_children())
+
+        for txn in reversed(self.transactions):
+            self.tree.insert("", "end", iid=txn.uid, values=self._row_values(txn), tags=(txn.kind,))
+        self.tree.tag_configure("income", foreground="#4ade80")
+        self.tree.tag_configure("expense", foreground="#fb7185")
+        self._update_table_status()
+
     def update_summary(self) -> None:
         current_month = datetime.now().strftime("%Y-%m")
-        income = sum(
-            txn.amount for txn in self.transactions if txn.kind == "income" and txn.month_key == current_month
-        )
-        expense = sum(
-            txn.amount for txn in self.transactions if txn.kind == "expense" and txn.month_key == current_month
-        )
-        balance = income - expense
+        income = expense = total_income = total_expense = 0.0
+        income_count = expense_count = 0
+        for txn in self.transactions:
+            if txn.kind == "income":
+                total_income += txn.amount
+                income_count += 1
+                if txn.month_key == current_month:
+                    income += txn.amount
+            elif txn.kind == "expense":
+                total_expense += txn.amount
+                expense_count += 1
+                if txn.month_key == current_month:
+                    expense += txn.amount
         self.month_income_var.set(self.format_currency(income))
         self.month_expense_var.set(self.format_currency(expense))
-        self.month_balance_var.set(self.format_currency(balance))
-        income_entries = [txn.amount for txn in self.transactions if txn.kind == "income"]
-        expense_entries = [txn.amount for txn in self.transactions if txn.kind == "expense"]
-        avg_income = sum(income_entries) / len(income_entries) if income_entries else 0
-        avg_expense = sum(expense_entries) / len(expense_entries) if expense_entries else 0
-        self.avg_income_var.set(self.format_currency(avg_income))
-        self.avg_expense_var.set(self.format_currency(avg_expense))
+        self.month_balance_var.set(self.format_currency(income - expense))
+        self.avg_income_var.set(self.format_currency(total_income / income_count if income_count else 0))
+        self.avg_expense_var.set(self.format_currency(total_expense / expense_count if expense_count else 0))
+
+    def _invalidate_aggregates(self) -> None:
+        self._np_cache = None
+        self._agg_cache = None
+
+    def _chart_data(self) -> tuple:
+        if self._agg_cache is None:
+            months, income_totals, expense_totals = self._monthly_totals()
+            if np is None:
+                income_amounts: dict[str, List[float]] = {month: [] for month in months}
+                expense_amounts: dict[str, List[float]] = {month: [] for month in months}
+                for txn in self.transactions:
+                    target = income_amounts if txn.kind == "income" else expense_amounts
+                    target[txn.month_key].append(txn.amount)
+            else:
+                amounts, is_income, _, month_idx = self._transaction_arrays()
+                income_amounts = self._split_by_month(amounts[is_income], month_idx[is_income], months)
+                expense_amounts = self._split_by_month(amounts[~is_income], month_idx[~is_income], months)
+            self._agg_cache = (months, income_totals, expense_totals, income_amounts, expense_amounts)
+        return self._agg_cache
+
+    @staticmethod
+    def _split_by_month(values, month_idx, months: List[str]) -> dict:
+        # Irasai surikiuoti pagal data, todel month_idx nemazeja ir kiekvienas menuo yra vientisas gabalas.
+        counts = np.bincount(month_idx, minlength=len(months))
+        return dict(zip(months, np.split(values, np.cumsum(counts)[:-1])))
+
+    def _transaction_arrays(self) -> tuple:
+        """Sumos, pajamu kauke ir menesiu indeksai kaip NumPy masyvai (perskaiciuojami tik po pakeitimu)."""
+        if self._np_cache is None:
+            count = len(self.transactions)
+            amounts = np.fromiter((txn.amount for txn in self.transactions), dtype=np.float64, count=count)
+            is_income = np.fromiter((txn.kind == "income" for txn in self.transactions), dtype=bool, count=count)
+            month_keys = np.array([txn.month_key for txn in self.transactions], dtype=str)
+            months, month_idx = np.unique(month_keys, return_inverse=True)
+            self._np_cache = (amounts, is_income, months, month_idx)
+        return self._np_cache
+
+    def _monthly_totals(self) -> tuple[List[str], List[float], List[float]]:
+        if np is None:
+            monthly_income: defaultdict[str, float] = defaultdict(float)
+            monthly_expense: defaultdict[str, float] = defaultdict(float)
+            for txn in self.transactions:
+                target = monthly_income if txn.kind == "income" else monthly_expense
+                target[txn.month_key] += txn.amount
+            months = sorted(set(monthly_income) | set(monthly_expense))
+            return (
+                months,
+                [monthly_income.get(month, 0.0) for month in months],
+                [monthly_expense.get(month, 0.0) for month in months],
+            )
+
+        amounts, is_income, months, month_idx = self._transaction_arrays()
+        size = len(months)
+        income = np.bincount(month_idx, weights=np.where(is_income, amounts, 0.0), minlength=size)
+        expense = np.bincount(month_idx, weights=np.where(is_income, 0.0, amounts), minlength=size)
+        return months.tolist(), income.tolist(), expense.tolist()
 
     def update_chart(self) -> None:
         canvas = self.chart_canvas
         canvas.delete("all")
 
-        monthly_income: defaultdict[str, float] = defaultdict(float)
-        monthly_expense: defaultdict[str, float] = defaultdict(float)
-        monthly_entries: defaultdict[str, dict[str, List[Transaction]]] = defaultdict(
-            lambda: {"income": [], "expense": []}
-        )
-        for txn in sorted(self.transactions, key=lambda tx: tx.date):
-            if txn.kind == "income":
-                monthly_income[txn.month_key] += txn.amount
-            else:
-                monthly_expense[txn.month_key] += txn.amount
-            monthly_entries[txn.month_key][txn.kind].append(txn)
-
-        months = sorted(monthly_entries.keys())
+        months, income_totals, expense_totals, income_amounts, expense_amounts = self._chart_data()
 
         canvas.update_idletasks()
         width = max(int(canvas.winfo_width()), 200)
@@ -499,9 +814,7 @@ class FinanceTracker(ttk.Frame):
             )
             return
 
-        labels = [datetime.strptime(month, "%Y-%m").strftime("%Y %b") for month in months]
-        income_totals = [monthly_income.get(month, 0) for month in months]
-        expense_totals = [monthly_expense.get(month, 0) for month in months]
+        labels = [f"{month[:4]} {_MONTH_ABBR[int(month[5:7]) - 1]}" for month in months]
         balance_values = [inc - exp for inc, exp in zip(income_totals, expense_totals)]
 
         usable_width = width - padding_left - padding_right
@@ -569,8 +882,8 @@ class FinanceTracker(ttk.Frame):
         for idx, month in enumerate(months):
             center_x = padding_left + slot_width * idx + slot_width / 2
 
-            incomes = monthly_entries[month]["income"]
-            expenses = monthly_entries[month]["expense"]
+            incomes = income_amounts[month]
+            expenses = expense_amounts[month]
 
             half_group = group_width / 2
             income_start = center_x - half_group
@@ -605,7 +918,7 @@ class FinanceTracker(ttk.Frame):
     def _draw_entry_columns(
         self,
         canvas: tk.Canvas,
-        entries: List[Transaction],
+        amounts,
         start_x: float,
         end_x: float,
         zero_y: float,
@@ -613,28 +926,39 @@ class FinanceTracker(ttk.Frame):
         color: str,
         above: bool,
     ) -> None:
-        if not entries or end_x <= start_x:
+        count = len(amounts)
+        if not count or end_x <= start_x:
             return
-        entries = list(entries)
-        count = len(entries)
         available_width = max(end_x - start_x, 10)
         spacing = 6 if count > 1 else 0
         effective_width = max(available_width - spacing * (count - 1), 4)
         bar_width = max(effective_width / count, 4)
-        x = start_x
-        for txn in entries:
-            height = txn.amount * scale
-            top = zero_y - height if above else zero_y
-            bottom = zero_y if above else zero_y + height
-            canvas.create_rectangle(x, top, x + bar_width, bottom, fill=color, outline="")
+        if numba is not None:
+            amounts = np.asarray(amounts, dtype=np.float64)
+        layout = _layout_bars(
+            amounts, float(start_x), float(bar_width), float(spacing), float(zero_y), float(scale), above
+        )
+        # Siauru stulpeliu etiketes neissitenka - tada rodoma viena bendra suma virs grupes.
+        show_label = bar_width >= 18
+        for (x0, y0, x1, y1, label_y), amount in zip(layout, amounts):
+            canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="")
+            if show_label:
+                canvas.create_text(
+                    (x0 + x1) / 2,
+                    label_y,
+                    text=self.format_currency(amount),
+                    fill="#cbd5f5",
+                    font=("Segoe UI", 8),
+                )
+        if not show_label:
+            label_y = min(item[4] for item in layout) if above else max(item[4] for item in layout)
             canvas.create_text(
-                x + bar_width / 2,
-                top - 10 if above else bottom + 10,
-                text=self.format_currency(txn.amount),
+                (layout[0][0] + layout[-1][2]) / 2,
+                label_y,
+                text=self.format_currency(float(sum(amounts))),
                 fill="#cbd5f5",
                 font=("Segoe UI", 8),
             )
-            x += bar_width + spacing
 
     def start_edit_selected(self) -> None:
         selection = self.tree.selection()
@@ -642,7 +966,7 @@ class FinanceTracker(ttk.Frame):
             messagebox.showinfo("Pasirinkimas", "Pasirinkite irasa kuri norite redaguoti.")
             return
         uid = selection[0]
-        txn = next((item for item in self.transactions if item.uid == uid), None)
+        txn = self._by_uid.get(uid)
         if txn is None:
             messagebox.showerror("Redagavimas", "Nepavyko rasti pasirinkto iraso.")
             return
@@ -677,32 +1001,41 @@ class FinanceTracker(ttk.Frame):
 
         try:
             if extension in {".xlsx", ".xlsm", ".xltx", ".xltm"}:
-                if openpyxl is None:
+                if openpyxl is None and python_calamine is None:
                     raise RuntimeError("Siai funkcijai reikia bibliotekos 'openpyxl'. Idiekite ja komanda 'pip install openpyxl'.")
                 rows = self._read_excel(path)
             elif extension == ".csv":
                 rows = self._read_csv(path)
             else:
                 raise RuntimeError("Nepalaikomas failo formatas. Naudokite .xlsx arba .csv.")
+            # Eilutes skaitomos srautu; pirmoji paimama cia, kad failo atidarymo klaidos butu pagautos.
+            header_row = next(rows, None)
         except Exception as exc:
             messagebox.showerror("Importo klaida", f"Nepavyko nuskaityti failo:\n{exc}")
             return
 
-        if not rows:
+        if header_row is None:
             messagebox.showinfo("Importas", "Failas tuscias.")
             return
 
-        header_row = rows[0]
+        # Likusios eilutes skaitomos importo metu; ju skaitymo klaidos pranesamos taip pat kaip atidarymo.
+        try:
+            self._import_rows(header_row, rows)
+        except ImportReadError as exc:
+            messagebox.showerror("Importo klaida", f"Nepavyko nuskaityti failo:\n{exc}")
+
+    def _import_rows(self, header_row: Sequence[object], rows: Iterator[Sequence[object]]) -> None:
         if self._row_has_letters(header_row):
             header = [self._normalize_header(value) for value in header_row]
-            data_rows = rows[1:]
+            data_rows: Iterator[Sequence[object]] = rows
         else:
             header = [f"column_{idx}" for idx in range(len(header_row))]
-            data_rows = rows
+            data_rows = chain([header_row], rows)
 
         special_mapping = self._detect_special_budget_layout(header)
         if not special_mapping:
-            special_mapping = self._detect_special_budget_layout_by_order(len(header), data_rows)
+            sample, data_rows = self._peek_rows(data_rows)
+            special_mapping = self._detect_special_budget_layout_by_order(len(header), sample)
         if special_mapping:
             self._import_special_budget(data_rows, special_mapping)
             return
@@ -716,22 +1049,19 @@ class FinanceTracker(ttk.Frame):
         description_idx = self._find_column(header, {"aprasymas", "aprasas", "description", "desc"})
         date_idx = self._find_column(header, {"data", "date"})
 
-        need_month_prompt = date_idx is None or any(
-            not self._get_cell(row, date_idx) for row in data_rows if any(row)
-        )
         fallback_month = None
         fallback_days = None
         fallback_counter = 1
-        if need_month_prompt:
+        if date_idx is None:
             fallback_month = self._ask_for_month()
             if not fallback_month:
                 return
-            fallback_days = monthrange(fallback_month.year, fallback_month.month)[1]
+            fallback_days = _days_in_month(fallback_month.year, fallback_month.month)
 
-        imported = 0
+        new_txns: List[Transaction] = []
         skipped = 0
         for raw in data_rows:
-            if not any(self._stringify(cell) for cell in raw):
+            if _row_is_blank(raw):
                 continue
             try:
                 amount = self._parse_amount(self._get_cell(raw, amount_idx))
@@ -742,7 +1072,13 @@ class FinanceTracker(ttk.Frame):
             kind = self._parse_kind(kind_text)
             date_value = self._parse_date_value(self._get_cell(raw, date_idx)) if date_idx is not None else None
             if date_value is None:
-                assert fallback_month is not None and fallback_days is not None
+                # Menuo klausiamas tik prie pirmos eilutes be datos - eilutes nera skaitomos is anksto.
+                if fallback_month is None:
+                    fallback_month = self._ask_for_month()
+                    if not fallback_month:
+                        return
+                    fallback_days = _days_in_month(fallback_month.year, fallback_month.month)
+                assert fallback_days is not None
                 day = min(fallback_counter, fallback_days)
                 fallback_counter = fallback_counter + 1 if fallback_counter < fallback_days else 1
                 date_value = fallback_month.replace(day=day)
@@ -758,21 +1094,30 @@ class FinanceTracker(ttk.Frame):
                 amount=round(amount, 2),
                 kind=kind,
             )
-            self.transactions.append(txn)
-            imported += 1
+            new_txns.append(txn)
 
+        new_txns, duplicates = self._drop_existing(new_txns)
+        imported = len(new_txns)
         if imported:
-            self.save_transactions()
+            with self._batch_save():
+                self.transactions.extend(new_txns)
+                self._sort_transactions()
+                self._append_transactions(new_txns)
             self.refresh_all()
             info = f"Sekmingai importuota {imported} irasu."
             if skipped:
                 info += f" Praleista {skipped} eil. del netinkamu duomenu."
+            if duplicates:
+                info += f" Praleista {duplicates} jau esanciu irasu."
             messagebox.showinfo("Importas", info)
+        elif duplicates:
+            messagebox.showinfo("Importas", "Visi failo irasai jau yra sarase.")
         else:
             messagebox.showinfo("Importas", "Nepavyko importuoti nei vieno iraso.")
 
-    def _import_special_budget(self, rows: List[List[object]], column_map: dict[str, int]) -> None:
-        if not rows:
+    def _import_special_budget(self, rows: Iterable[Sequence[object]], column_map: dict[str, int]) -> None:
+        first, rows = self._peek_rows(rows, 1)
+        if not first:
             messagebox.showinfo("Importas", "Failas neturi duomenu.")
             return
 
@@ -788,58 +1133,91 @@ class FinanceTracker(ttk.Frame):
             return
         sequential_months = bool(sequential_answer)
 
-        imported = 0
+        # Tik lenteleje rastu stulpeliu aprasai - vidinis ciklas netikrina visu raktu kiekvienai eilutei.
+        active_specs = [
+            (spec, column_map[key]) for key, spec in SPECIAL_BUDGET_COLUMNS.items() if key in column_map
+        ]
+        new_txns: List[Transaction] = []
         for idx, raw in enumerate(rows):
-            if not any(self._stringify(cell) for cell in raw):
+            if _row_is_blank(raw):
                 continue
-            txn_date = self._month_for_special_row(base_month, idx, sequential_months)
-            for key, spec in SPECIAL_BUDGET_COLUMNS.items():
-                column_index = column_map.get(key)
-                if column_index is None or column_index >= len(raw):
-                    continue
-                cell_value = self._get_cell(raw, column_index)
-                if self._stringify(cell_value) == "":
-                    continue
-                try:
-                    amount = self._parse_amount(cell_value)
-                except ValueError:
+            # Visi eilutes irasai gauna ta pacia data - formatuojama viena karta eilutei.
+            date_text = self._month_for_special_row(base_month, idx, sequential_months).strftime("%Y-%m-%d")
+            row_len = len(raw)
+            for spec, column_index in active_specs:
+                if column_index >= row_len:
                     continue
+                # _stringify + _parse_amount vienoje vietoje: skaiciai imami tiesiai, tekstas valomas viena karta.
+                cell_value = raw[column_index]
+                if isinstance(cell_value, (int, float)):
+                    amount = float(cell_value)
+                else:
+                    text = "" if cell_value is None else str(cell_value).strip()
+                    if not text:
+                        continue
+                    try:
+                        amount = _parse_amount_text(text)
+                    except ValueError:
+                        continue
                 if amount == 0:
                     continue
                 amount_value = abs(amount)
                 kind = spec["kind"]
                 txn = Transaction(
                     uid=uuid4().hex,
-                    date=txn_date.strftime("%Y-%m-%d"),
+                    date=date_text,
                     category=spec["category"],
                     description=spec["description"],
                     amount=round(amount_value, 2),
                     kind=kind if kind != "auto" else ("income" if amount >= 0 else "expense"),
                 )
-                self.transactions.append(txn)
-                imported += 1
+                new_txns.append(txn)
 
+        new_txns, duplicates = self._drop_existing(new_txns)
+        imported = len(new_txns)
         if imported:
-            self.save_transactions()
+            with self._batch_save():
+                self.transactions.extend(new_txns)
+                self._sort_transactions()
+                self._append_transactions(new_txns)
             self.refresh_all()
-            messagebox.showinfo("Importas", f"Importuota {imported} irasu pagal specialia lentele.")
+            info = f"Importuota {imported} irasu pagal specialia lentele."
+            if duplicates:
+                info += f" Praleista {duplicates} jau esanciu irasu."
+            messagebox.showinfo("Importas", info)
+        elif duplicates:
+            messagebox.showinfo("Importas", "Visi lenteles irasai jau yra sarase.")
         else:
             messagebox.showinfo("Importas", "Nepavyko importuoti irasu is lenteles.")
 
+    @staticmethod
+    def _content_key(txn: Transaction) -> tuple:
+        return (txn.date, txn.category, round(txn.amount, 2), txn.kind, txn.description)
+
+    def _drop_existing(self, new_txns: List[Transaction]) -> tuple[List[Transaction], int]:
+        """Pasalina irasus, kurie jau yra sarase (pakartotinis to paties failo importas).
+
+        Lyginama tik su jau esanciais irasais - vienodi irasai tame paciame faile paliekami.
+        """
+        existing = {self._content_key(txn) for txn in self.transactions}
+        kept = [txn for txn in new_txns if self._content_key(txn) not in existing]
+        return kept, len(new_txns) - len(kept)
+
     def _detect_special_budget_layout(self, header: List[str]) -> dict[str, int] | None:
         mapping: dict[str, int] = {}
-        for key, spec in SPECIAL_BUDGET_COLUMNS.items():
-            idx = self._find_column(header, spec["aliases"])
-            if idx is not None:
-                mapping[key] = idx
+        for idx, name in enumerate(header):
+            key = ALIAS_TO_KEY.get(name)
+            if key is not None:
+                mapping.setdefault(key, idx)
         return mapping or None
 
-    def _detect_special_budget_layout_by_order(self, column_count: int, rows: List[List[object]]) -> dict[str, int] | None:
+    def _detect_special_budget_layout_by_order(self, column_count: int, rows: List[Sequence[object]]) -> dict[str, int] | None:
         order = ["alga", "nuoma", "komunaliniai", "maistas", "papildomai", "lieka"]
         mapping: dict[str, int] = {}
+        has_numeric = self._numeric_columns(rows, column_count)
         column_index = 0
         for key in order:
-            while column_index < column_count and not self._column_has_numeric(rows, column_index):
+            while column_index < column_count and not has_numeric[column_index]:
                 column_index += 1
             if column_index >= column_count:
                 break
@@ -852,49 +1230,84 @@ class FinanceTracker(ttk.Frame):
             month = base.month - 1 + row_index
             year = base.year + month // 12
             month = month % 12 + 1
-            day = min(base.day, monthrange(year, month)[1])
+            day = min(base.day, _days_in_month(year, month))
             return datetime(year, month, day)
-        day = min(row_index + 1, monthrange(base.year, base.month)[1])
+        day = min(row_index + 1, _days_in_month(base.year, base.month))
         return base.replace(day=day)
 
-    def _column_has_numeric(self, rows: List[List[object]], index: int) -> bool:
+    def _numeric_columns(self, rows: List[Sequence[object]], column_count: int) -> List[bool]:
+        """Vienu perejimu per eilutes pazymi stulpelius, kuriuose yra bent viena suma."""
+        has_numeric = [False] * column_count
+        remaining = column_count
         for row in rows:
-            if index >= len(row):
-                continue
-            cell = self._get_cell(row, index)
-            text = self._stringify(cell)
-            if not text:
-                continue
+            for index, cell in enumerate(row[:column_count]):
+                if has_numeric[index]:
+                    continue
+                if isinstance(cell, (int, float)) or _AMOUNT_RE.fullmatch(self._stringify(cell)):
+                    has_numeric[index] = True
+                    remaining -= 1
+            if not remaining:
+                break
+        return has_numeric
+
+    def _read_excel(self, path: Path) -> Iterator[Sequence[object]]:
+        try:
+            yield from self._read_excel_rows(path)
+        except Exception as exc:
+            raise ImportReadError(exc) from exc
+
+    def _read_excel_rows(self, path: Path) -> Iterator[Sequence[object]]:
+        if python_calamine is not None:
+            # calamine (Rust) skaito xlsx greiciau nei openpyxl; skip_empty_area=False, kad eilutes/stulpeliai sutaptu su openpyxl.
+            workbook = python_calamine.CalamineWorkbook.from_path(str(path))
             try:
-                self._parse_amount(cell)
-                return True
-            except ValueError:
-                continue
-        return False
+                # calamine nezino aktyvaus lapo, todel jis imamas is workbook.xml kaip openpyxl atveju
+                sheet_index = self._active_sheet_index(path)
+                if sheet_index >= len(workbook.sheet_names):
+                    sheet_index = 0
+                for row in workbook.get_sheet_by_index(sheet_index).to_python(skip_empty_area=False):
+                    yield tuple(row)
+            finally:
+                workbook.close()
+            return
+        # read_only rezimas skaito lapa eilutemis ir nekrauna stiliu; zip failas laikomas atidarytas iki close().
+        workbook = openpyxl.load_workbook(path, data_only=True, read_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield tuple(value if value is not None else "" for value in row)
+        finally:
+            workbook.close()
 
-    def _read_excel(self, path: Path) -> List[List[object]]:
-        workbook = openpyxl.load_workbook(path, data_only=True)
-        sheet = workbook.active
-        rows: List[List[object]] = []
-        for row in sheet.iter_rows(values_only=True):
-            normalized = [value if value is not None else "" for value in row]
-            rows.append(normalized)
-        return rows
+    @staticmethod
+    def _active_sheet_index(path: Path) -> int:
+        with zipfile.ZipFile(path) as archive:
+            try:
+                workbook_xml = archive.read("xl/workbook.xml")
+            except KeyError:
+                return 0
+        match = _ACTIVE_TAB_RE.search(workbook_xml)
+        return int(match.group(1)) if match else 0
 
-    def _read_csv(self, path: Path) -> List[List[object]]:
-        with path.open(encoding="utf-8-sig", newline="") as file:
-            reader = csv.reader(file)
-            return [row for row in reader]
+    def _read_csv(self, path: Path) -> Iterator[Sequence[object]]:
+        try:
+            with path.open(encoding="utf-8-sig", newline="", buffering=1 << 20) as file:
+                yield from csv.reader(file)
+        except Exception as exc:
+            raise ImportReadError(exc) from exc
+
+    @staticmethod
+    def _peek_rows(
+        rows: Iterable[Sequence[object]], count: int = 200
+    ) -> tuple[List[Sequence[object]], Iterator[Sequence[object]]]:
+        """Paima pirmas eilutes tikrinimui ir grazina iteratoriu, kuris jas vel pateikia."""
+        rows = iter(rows)
+        sample = list(islice(rows, count))
+        return sample, chain(sample, rows)
 
     @staticmethod
     def _normalize_header(value: object) -> str:
         text = (str(value) if value is not None else "").strip().lower()
-        translation = str.maketrans(
-            "\u0105\u010d\u0119\u0117\u012f\u0161\u0173\u016b\u017e\u0104\u010c\u0118\u0116\u012e\u0160\u0172\u016a\u017d",
-            "aceeisuuzACEEISUUZ",
-        )
-        text = text.translate(translation)
-        return "".join(ch for ch in text if ch.isalnum())
+        return _HEADER_STRIP_RE.sub("", text.translate(_HEADER_TRANSLATION))
 
     @staticmethod
     def _find_column(header: List[str], targets: set[str]) -> int | None:
@@ -921,8 +1334,7 @@ class FinanceTracker(ttk.Frame):
             raise ValueError("Tuscia suma")
         if isinstance(value, (int, float)):
             return float(value)
-        cleaned = str(value).replace("EUR", "").replace(",", ".").strip()
-        return float(cleaned)
+        return _parse_amount_text(str(value))
 
     @staticmethod
     def _parse_kind(value: object) -> str:
@@ -934,25 +1346,19 @@ class FinanceTracker(ttk.Frame):
         return "expense"
 
     @staticmethod
-    def _parse_date_value(value: object) -> datetime | None:
+    def _parse_date_value(value: object) -> date | None:
+        """Grazina date (arba datetime, jei reiksme turi laika) - kvieciantysis ja tik formatuoja."""
         if value in (None, ""):
             return None
-        if isinstance(value, datetime):
-            return value
         if isinstance(value, date):
-            return datetime(value.year, value.month, value.day)
+            return value
         if isinstance(value, (int, float)):
             base = datetime(1899, 12, 30)
             return base + timedelta(days=float(value))
         text = str(value).strip()
         if not text:
             return None
-        for fmt in ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%d.%m.%Y", "%m/%d/%Y"):
-            try:
-                return datetime.strptime(text, fmt)
-            except ValueError:
-                continue
-        return None
+        return _parse_date_text(text)
 
     def _ask_for_month(self) -> datetime | None:
         while True:
@@ -969,12 +1375,9 @@ class FinanceTracker(ttk.Frame):
                 messagebox.showerror("Netinkamas formatas", "Menuo turi buti formatu YYYY-MM, pvz, 2024-10.")
 
     @staticmethod
-    def _row_has_letters(row: List[object]) -> bool:
-        for cell in row:
-            text = str(cell) if cell is not None else ""
-            if any(ch.isalpha() for ch in text):
-                return True
-        return False
+    def _row_has_letters(row: Sequence[object]) -> bool:
+        joined = "\x01".join("" if cell is None else str(cell) for cell in row)
+        return _LETTER_RE.search(joined) is not None
 
     def delete_selected(self) -> None:
         selected = self.tree.selection()
@@ -984,9 +1387,20 @@ class FinanceTracker(ttk.Frame):
         if not messagebox.askyesno("Patvirtinimas", "Ar tikrai norite pasalinti pasirinktus irasus?"):
             return
         selected_ids = set(selected)
-        self.transactions = [txn for txn in self.transactions if txn.uid not in selected_ids]
-        self.save_transactions()
-        self.refresh_all()
+        removed = [self._by_uid.pop(uid) for uid in selected_ids if uid in self._by_uid]
+        if len(removed) <= 64:
+            # Keli irasai randami per _dates ir salinami vietoje, be viso saraso perkurimo.
+            for idx in sorted((self._index_of(txn) for txn in removed), reverse=True):
+                del self.transactions[idx]
+                del self._dates[idx]
+        else:
+            self.transactions = [txn for txn in self.transactions if txn.uid not in selected_ids]
+            self._dates = [txn.date for txn in self.transactions]
+        self._rewrite_all()
+        self.tree.delete(*selected_ids)
+        self._update_table_status()
+        self.update_summary()
+        self.update_chart()
 
 
 def main() -> None:
@@ -11,16 +11,24 @@ Savybės:
 
 from __future__ import annotations
 
+import csv
 import os
 import re
-from datetime import date, datetime
-from typing import Optional
+from bisect import bisect_left
+from datetime import date
+from functools import lru_cache
+from itertools import chain
+from typing import Iterator, Optional
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
-from sqlalchemy import Column, Date, Float, Integer, String, create_engine, func, text
+from sqlalchemy import (
+    Column, Date, Float, Integer, String, bindparam, create_engine, event, func, insert, or_, select, text, update
+)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.sql import Select, Update
 
 try:
     import pandas as pd  # type: ignore
@@ -31,8 +39,38 @@ except Exception:  # pragma: no cover
 
 # ------------------ DB ------------------
 DB_PATH = "inventory.db"
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+    "mmap_size=268435456",
+)
 engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True)
-Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+@event.listens_for(engine, "connect")
+def apply_sqlite_pragmas(dbapi_conn, _record) -> None:
+    cursor = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+# Skaitymams atskiras variklis: AUTOCOMMIT be BEGIN, o query_only neleidzia per ji nieko rasyti.
+read_engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True, isolation_level="AUTOCOMMIT")
+
+
+@event.listens_for(read_engine, "connect")
+def apply_read_pragmas(dbapi_conn, record) -> None:
+    apply_sqlite_pragmas(dbapi_conn, record)
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA query_only=1")
+    cursor.close()
+
+
+# Rasymai vyksta tik per aiskius session.begin() blokus; skaitymai eina per read_engine jungti.
+Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, autobegin=False)
 Base = declarative_base()
 
 
@@ -53,35 +91,108 @@ class Product(Base):
 
 Base.metadata.create_all(engine)
 
-
-def ensure_comment_column() -> None:
+# Tik lentelėje rodomi stulpeliai - sąrašui nereikia pilnų ORM objektų.
+PRODUCT_ROW_COLUMNS = (
+    Product.id,
+    Product.external_id,
+    Product.name,
+    Product.dimension,
+    Product.comment,
+    Product.published,
+    Product.barcode,
+    Product.quantity,
+    Product.price,
+    Product.added_at,
+)
+
+# CSV eksporto stulpeliai, ta pacia tvarka kaip eksportuojamos reiksmes.
+EXPORT_HEADERS = (
+    "Parduotuvės ID",
+    "Pavadinimas",
+    "Matmuo",
+    "Komentaras",
+    "Paskelbta",
+    "Barkodas",
+    "Kiekis",
+    "Kaina (EUR)",
+    "Bendra (EUR)",
+    "Data",
+)
+
+# Kiek eiluciu sarasas uzkrauna vienu kartu; kitas puslapis imamas priartejus prie apacios.
+PRODUCT_PAGE_SIZE = 200
+# Importuojamos naujos prekes rasomos tokio dydzio executemany paketais, kad dict'u sarasas neaugtu be ribu.
+IMPORT_BATCH_SIZE = 10_000
+# CSV importas skaitomas ir irasomas tokio dydzio dalimis (viena transakcija kiekvienai).
+IMPORT_CHUNK_ROWS = 50_000
+
+
+# Stulpeliai, pridėti po pirmos versijos: (pavadinimas, SQL tipas).
+MIGRATED_COLUMNS = (
+    ("comment", "TEXT"),
+    ("published", "TEXT DEFAULT 'Ne'"),
+    ("external_id", "TEXT"),
+)
+
+
+def ensure_schema() -> None:
     with engine.begin() as conn:
         columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(products)")}
-        if "comment" not in columns:
-            conn.exec_driver_sql("ALTER TABLE products ADD COLUMN comment TEXT")
+        for name, ddl in MIGRATED_COLUMNS:
+            if name not in columns:
+                conn.exec_driver_sql(f"ALTER TABLE products ADD COLUMN {name} {ddl}")
+        # lower(name) naudojamas paieskai ir save_product; external_id, pridetas per ALTER, neturi UNIQUE indekso.
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_products_lower_name ON products (lower(name))")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_products_external_id ON products (external_id)")
 
 
-ensure_comment_column()
-
-
-def ensure_published_column() -> None:
-    with engine.begin() as conn:
-        columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(products)")}
-        if "published" not in columns:
-            conn.exec_driver_sql("ALTER TABLE products ADD COLUMN published TEXT DEFAULT 'Ne'")
+ensure_schema()
 
 
-ensure_published_column()
+# Paieskos stulpeliai, indeksuojami FTS5 trigram lenteleje (substring paieska be pilno skenavimo).
+FTS_COLUMNS = "name, comment, barcode, external_id, dimension"
 
 
-def ensure_external_id_column() -> None:
-    with engine.begin() as conn:
-        columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(products)")}
-        if "external_id" not in columns:
-            conn.exec_driver_sql("ALTER TABLE products ADD COLUMN external_id TEXT")
+def ensure_fts() -> bool:
+    new_values = ", ".join(f"new.{name}" for name in FTS_COLUMNS.split(", "))
+    old_values = ", ".join(f"old.{name}" for name in FTS_COLUMNS.split(", "))
+    try:
+        with engine.begin() as conn:
+            exists = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+            ).first()
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5({FTS_COLUMNS}, "
+                "content='products', content_rowid='id', tokenize='trigram')"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+                f"INSERT INTO products_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {new_values}); END"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+                f"INSERT INTO products_fts(products_fts, rowid, {FTS_COLUMNS}) "
+                f"VALUES ('delete', old.id, {old_values}); END"
+            )
+            # tik indeksuojamu stulpeliu pakeitimai (ne kiekis ar kaina) perraso FTS irasa;
+            # senose DB trigeris buvo be stulpeliu saraso, todel jis sukuriamas is naujo
+            conn.exec_driver_sql("DROP TRIGGER IF EXISTS products_fts_au")
+            conn.exec_driver_sql(
+                f"CREATE TRIGGER products_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON products BEGIN "
+                f"INSERT INTO products_fts(products_fts, rowid, {FTS_COLUMNS}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO products_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {new_values}); END"
+            )
+            if not exists:
+                # esamos prekes suindeksuojamos viena karta
+                conn.exec_driver_sql("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+    except OperationalError:
+        # SQLite be FTS5 ar trigram (< 3.34): paieska lieka per LIKE
+        return False
+    return True
 
 
-ensure_external_id_column()
+HAS_FTS = ensure_fts()
 
 
 # ------------------ Pagalbinės funkcijos ------------------
@@ -104,6 +215,35 @@ def normalize_text(value: str) -> str:
     return (value or "").strip()
 
 
+def normalize_header(value: str) -> str:
+    return normalize_text(value).strip('"').lstrip("\ufeff").lower()
+
+
+# Importo laukai: (raktas, stulpelio pavadinimas, sinonimai, numatyta reiksme).
+IMPORT_FIELDS = (
+    ("external_id", "ID", {"id", "prekės kodas", "prekes kodas", "sku"}, ""),
+    ("name", "Pavadinimas", {"pavadinimas", "name", "title"}, ""),
+    ("dimension", "Matmuo", {"matmuo", "matmenys", "dimensions", "size", "matmenys (cm)"}, ""),
+    (
+        "comment",
+        "Komentaras",
+        {"komentaras", "aprašymas", "aprasymas", "description", "trumpas apibūdinimas", "pirkimo pastaba"},
+        "",
+    ),
+    ("published", "Paskelbtas", {"paskelbtas", "published"}, ""),
+    ("barcode", "Barkodas", {"gtin, upc, ean, or isbn", "ean", "barkodas", "barcode"}, ""),
+    ("quantity", "Kiekis", {"atsargos", "kiekis", "likutis", "stock", "qty"}, ""),
+    ("price", "Kaina", {"kaina", "kaina (eur)", "price", "price eur"}, ""),
+    ("total", "Bendra", {"bendra", "bendra (eur)", "total", "suma"}, ""),
+    ("date", "Data", {"data", "date"}, ""),
+)
+
+# Normalizuotas CSV antrastes pavadinimas -> lauko raktas; sudaromas viena karta.
+IMPORT_HEADER_KEYS = {
+    alias: key for key, label, aliases, _ in IMPORT_FIELDS for alias in {*aliases, normalize_header(label)}
+}
+
+
 def normalize_barcode_value(value: str) -> str:
     text = normalize_text(value)
     if text in {"0", "00", "000"}:
@@ -111,6 +251,8 @@ def normalize_barcode_value(value: str) -> str:
     return text
 
 
+# Reiksmiu aibe maza (Taip/Ne ir keli sinonimai), todel rezultatai kesuojami.
+@lru_cache(maxsize=64)
 def normalize_published_value(value: str) -> str:
     normalized = normalize_text(value).lower()
     if normalized in {"1", "true", "taip", "yes", "y", "published", "aktyvus", "aktyvi", "aktyviu"}:
@@ -120,38 +262,90 @@ def normalize_published_value(value: str) -> str:
     return "Ne"
 
 
+# +2:barkodas / -1:barkodas skenerio komanda; grupes: zenklas, kiekis, barkodas.
+_BARCODE_ACTION_RE = re.compile(r"^([+-])(\d+):(\S+)$")
+
+
+def _barcode_quantity_update(new_quantity) -> Update:
+    return (
+        update(Product)
+        .where(Product.barcode == bindparam("scanned_barcode"))
+        .values(quantity=new_quantity)
+        .returning(Product)
+        # grazinta preke perrasoma ir sesijoje, jei ji ten jau buvo
+        .execution_options(populate_existing=True)
+    )
+
+
+# Skenerio UPDATE sakiniai sudaromi viena karta; kiekvienas skenavimas tik perduoda barkoda ir kieki.
+_BARCODE_QTY = func.coalesce(Product.quantity, 0)
+_BARCODE_ADD_STMT = _barcode_quantity_update(_BARCODE_QTY + bindparam("delta", type_=Integer))
+_BARCODE_SUBTRACT_STMT = _barcode_quantity_update(func.max(0, _BARCODE_QTY - bindparam("delta", type_=Integer)))
+
+# Tie patys formatai kaip strptime("%Y-%m-%d", "%Y/%m/%d", "%d.%m.%Y", "%Y.%m.%d", "%d-%m-%Y"), be strptime kainos.
+_DATE_RES = (
+    (re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})", re.ASCII), lambda m: date(int(m[1]), int(m[2]), int(m[3]))),
+    (re.compile(r"(\d{4})/(\d{1,2})/(\d{1,2})", re.ASCII), lambda m: date(int(m[1]), int(m[2]), int(m[3]))),
+    (re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", re.ASCII), lambda m: date(int(m[3]), int(m[2]), int(m[1]))),
+    (re.compile(r"(\d{4})\.(\d{1,2})\.(\d{1,2})", re.ASCII), lambda m: date(int(m[1]), int(m[2]), int(m[3]))),
+    (re.compile(r"(\d{1,2})-(\d{1,2})-(\d{4})", re.ASCII), lambda m: date(int(m[3]), int(m[2]), int(m[1]))),
+)
+
+
 def parse_date_value(value: str) -> Optional[date]:
     text = normalize_text(value)
     if not text:
         return None
-    patterns = ("%Y-%m-%d", "%Y/%m/%d", "%d.%m.%Y", "%Y.%m.%d", "%d-%m-%Y")
-    for pattern in patterns:
-        try:
-            return datetime.strptime(text, pattern).date()
-        except ValueError:
-            continue
+    for pattern, build in _DATE_RES:
+        match = pattern.fullmatch(text)
+        if match:
+            try:
+                return build(match)
+            except ValueError:
+                return None
     try:
         return date.fromisoformat(text)
     except ValueError:
         return None
 
 
-def is_barcode_unique(session, barcode: str, exclude_id: Optional[int] = None) -> bool:
-    if not barcode:
-        return True
-    query = session.query(Product).filter(Product.barcode == barcode)
-    if exclude_id:
-        query = query.filter(Product.id != exclude_id)
-    return not query.count()
+def chunked(values: set[str], size: int = 900) -> list[list[str]]:
+    """Skaido reiksmes i dalis, telpancias i SQLite IN (...) parametru limita."""
+    items = list(values)
+    return [items[start:start + size] for start in range(0, len(items), size)]
 
 
-def is_external_id_unique(session, external_id: str, exclude_id: Optional[int] = None) -> bool:
-    if not external_id:
-        return True
-    query = session.query(Product).filter(Product.external_id == external_id)
-    if exclude_id:
-        query = query.filter(Product.id != exclude_id)
-    return not query.count()
+# SQLite lower() keicia tik ASCII raides; rikiavimas Python'e turi sutapti su ORDER BY lower(name).
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def product_sort_key(product) -> tuple[str, int]:
+    return (product.name or "").translate(_ASCII_LOWER), product.id
+
+
+def product_row(product) -> tuple[tuple, tuple]:
+    """Grazina (values, tags) vienai saraso eilutei is Product arba Row."""
+    qty = product.quantity or 0
+    price = product.price or 0.0
+    total = qty * price
+    tags = ()
+    if qty == 0:
+        tags = ("low",)
+    elif qty >= 5:
+        tags = ("ok",)
+    values = (
+        product.external_id or "-",
+        product.name,
+        product.dimension or "-",
+        product.comment or "-",
+        normalize_published_value(product.published or ""),
+        product.barcode or "-",
+        qty,
+        f"{price:.2f}",
+        f"{total:.2f}",
+        product.added_at.strftime("%Y-%m-%d") if product.added_at else "",
+    )
+    return values, tags
 
 
 # ------------------ GUI ------------------
@@ -164,8 +358,21 @@ class App(tk.Tk):
         self.configure(bg="#0f172a")
 
         self.session = Session()
+        # ilgai gyvuojanti skaitymo jungtis: SELECT be BEGIN, WAL leidzia skaityti rasymo metu
+        self.read_conn = read_engine.connect()
         self.active_product_id: Optional[int] = None
         self.status_after: Optional[str] = None
+        # rodomo saraso uzklausa ir kiek jos eiluciu jau ideta i medi
+        self.view_query: Select = select(*PRODUCT_ROW_COLUMNS)
+        self.view_total = 0
+        self.view_loaded = 0
+        self.view_filtered = False
+        # uzkrautu eiluciu rikiavimo raktai ta pacia tvarka kaip medyje
+        self.view_keys: list[tuple[str, int]] = []
+        self.product_count = 0
+        self.page_after: Optional[str] = None
+        self.total_after: Optional[str] = None
+        self.total_inputs: tuple[str, str] = ("", "")
 
         # spalvos ir stiliai
         self.colors = {
@@ -382,8 +589,8 @@ class App(tk.Tk):
                   background=self.colors["card"], foreground=self.colors["accent"]).grid(
             row=16, column=0, sticky="w")
 
-        self.qty_var.trace_add("write", lambda *_: self.update_total())
-        self.price_var.trace_add("write", lambda *_: self.update_total())
+        self.qty_var.trace_add("write", lambda *_: self.schedule_total())
+        self.price_var.trace_add("write", lambda *_: self.schedule_total())
 
         buttons = ttk.Frame(form, style="Card.TFrame")
         buttons.grid(row=17, column=0, sticky="ew", pady=(16, 0))
@@ -457,10 +664,10 @@ class App(tk.Tk):
         self.product_tree.column("total", width=120, anchor="center")
         self.product_tree.column("added", width=110, anchor="center")
 
-        scroll_y = ttk.Scrollbar(table_card, orient="vertical", command=self.product_tree.yview)
-        self.product_tree.configure(yscrollcommand=scroll_y.set)
+        self.product_scroll = ttk.Scrollbar(table_card, orient="vertical", command=self.product_tree.yview)
+        self.product_tree.configure(yscrollcommand=self.on_tree_scroll)
         self.product_tree.grid(row=1, column=0, sticky="nsew", pady=(8, 0))
-        scroll_y.grid(row=1, column=1, sticky="ns", pady=(8, 0))
+        self.product_scroll.grid(row=1, column=1, sticky="ns", pady=(8, 0))
 
         self.product_tree.tag_configure("low", foreground=self.colors["danger"])
         self.product_tree.tag_configure("ok", foreground=self.colors["success"])
@@ -468,42 +675,75 @@ class App(tk.Tk):
         self.product_tree.bind("<Delete>", lambda _e: self.delete_product())
 
     # ---------- Veiksmai ----------
-    def load_products(self, products: Optional[list[Product]] = None) -> None:
-        if products is None:
-            products = self.session.query(Product).order_by(func.lower(Product.name)).all()
-
-        self.product_tree.delete(*self.product_tree.get_children())
-        for product in products:
-            qty = product.quantity or 0
-            price = product.price or 0.0
-            total = qty * price
-            published_value = normalize_published_value(product.published or "")
-            tags = ()
-            if qty == 0:
-                tags = ("low",)
-            elif qty >= 5:
-                tags = ("ok",)
-            self.product_tree.insert(
-                "",
-                "end",
-                iid=str(product.id),
-                values=(
-                    product.external_id or "-",
-                    product.name,
-                    product.dimension or "-",
-                    product.comment or "-",
-                    published_value,
-                    product.barcode or "-",
-                    qty,
-                    f"{price:.2f}",
-                    f"{total:.2f}",
-                    product.added_at.strftime("%Y-%m-%d") if product.added_at else "",
-                ),
-                tags=tags,
-            )
+    def load_products(self, query: Optional[Select] = None) -> None:
+        self.view_filtered = query is not None
+        if query is None:
+            query = select(*PRODUCT_ROW_COLUMNS)
+        # id papildomai, kad OFFSET puslapiai butu stabilus esant vienodiems pavadinimams
+        self.view_query = query.order_by(func.lower(Product.name), Product.id)
+        self.view_total = self.read_conn.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+        self.view_loaded = 0
+        self.view_keys = []
+
+        tree = self.product_tree
+        tree.delete(*tree.get_children())
+        self.load_next_page()
+
+        self.view_info_var.set(f"Rodoma: {self.view_total}")
+        self.update_stats()
+
+    def load_next_page(self) -> bool:
+        self.page_after = None
+        if self.view_loaded >= self.view_total:
+            return False
+        products = self.read_conn.execute(
+            self.view_query.offset(self.view_loaded).limit(PRODUCT_PAGE_SIZE)
+        ).all()
+        if not products:
+            self.view_total = self.view_loaded
+            return False
+
+        # Reikšmės suformuojamos iš anksto, cikle lieka tik Tcl insert kvietimai.
+        items = [(str(product.id), *product_row(product)) for product in products]
+        insert = self.product_tree.insert
+        for iid, values, tags in items:
+            insert("", "end", iid=iid, values=values, tags=tags)
+        self.view_keys.extend(product_sort_key(product) for product in products)
+        self.view_loaded += len(products)
+        return True
+
+    def sync_tree_row(self, product_id: int, product: Optional[Product] = None) -> None:
+        """Po vienos prekes pakeitimo atnaujina tik jos eilute; product=None reiskia istrinta."""
+        if self.view_filtered:
+            # filtruotas sarasas rodomas is naujo visas, kaip ir anksciau
+            self.load_products()
+            return
+        tree = self.product_tree
+        iid = str(product_id)
+        complete = self.view_loaded >= self.view_total
+        if tree.exists(iid):
+            del self.view_keys[tree.index(iid)]
+            tree.delete(iid)
+            self.view_loaded -= 1
+        if product is not None:
+            key = product_sort_key(product)
+            position = bisect_left(self.view_keys, key)
+            # uz paskutines uzkrautos eilutes esanti preke bus paimta su kitu puslapiu
+            if position < len(self.view_keys) or complete:
+                values, tags = product_row(product)
+                tree.insert("", position, iid=iid, values=values, tags=tags)
+                self.view_keys.insert(position, key)
+                self.view_loaded += 1
 
-        self.view_info_var.set(f"Rodoma: {len(products)}")
         self.update_stats()
+        self.view_total = self.product_count
+        self.view_info_var.set(f"Rodoma: {self.view_total}")
+
+    def on_tree_scroll(self, first: str, last: str) -> None:
+        self.product_scroll.set(first, last)
+        # priartejus prie apacios kitas puslapis uzkraunamas po dabartinio scroll ivykio
+        if float(last) >= 0.9 and self.view_loaded < self.view_total and not self.page_after:
+            self.page_after = self.after_idle(self.load_next_page)
 
     def get_comment_text(self) -> str:
         if not hasattr(self, "comment_text"):
@@ -523,7 +763,8 @@ class App(tk.Tk):
             return None
         product_id = int(selection[0])
         self.active_product_id = product_id
-        return self.session.get(Product, product_id)
+        with self.session.begin():
+            return self.session.get(Product, product_id)
 
     def save_product(self) -> None:
         name = normalize_text(self.name_var.get())
@@ -539,55 +780,67 @@ class App(tk.Tk):
             messagebox.showerror("Klaida", "Įveskite prekės pavadinimą.")
             return
 
-        product = None
-        if barcode:
-            product = self.session.query(Product).filter(Product.barcode == barcode).first()
-        if not product and external_id:
-            product = self.session.query(Product).filter(Product.external_id == external_id).first()
-        if not product and self.active_product_id:
-            product = self.session.get(Product, self.active_product_id)
-        if not product:
-            product = self.session.query(Product).filter(func.lower(Product.name) == name.lower()).first()
+        try:
+            with self.session.begin():
+                # Vienas SELECT visiems kandidatams; prioritetas (barkodas, ID, aktyvi prekė, pavadinimas)
+                # taikomas Python'e.
+                name_match = (func.lower(Product.name) == name.lower()).label("name_match")
+                conditions = [name_match]
+                if barcode:
+                    conditions.append(Product.barcode == barcode)
+                if external_id:
+                    conditions.append(Product.external_id == external_id)
+                if self.active_product_id:
+                    conditions.append(Product.id == self.active_product_id)
+                candidates = (
+                    self.session.query(Product, name_match).filter(or_(*conditions)).order_by(Product.id).all()
+                )
 
-        if barcode and not is_barcode_unique(self.session, barcode,
-                                             exclude_id=product.id if product else None):
-            messagebox.showerror("Klaida", f"Barkodas {barcode} jau naudojamas kitai prekei.")
-            return
-        if external_id and not is_external_id_unique(self.session, external_id,
-                                                     exclude_id=product.id if product else None):
-            messagebox.showerror("Klaida", f"Parduotuvės ID {external_id} jau priskirtas kitai prekei.")
-            return
+                barcode_owner = next((item for item, _ in candidates if barcode and item.barcode == barcode), None)
+                external_owner = next(
+                    (item for item, _ in candidates if external_id and item.external_id == external_id), None
+                )
+                product = (
+                    barcode_owner
+                    or external_owner
+                    or next((item for item, _ in candidates if item.id == self.active_product_id), None)
+                    or next((item for item, matched in candidates if matched), None)
+                )
 
-        if product:
-            product.external_id = external_id or None
-            product.name = name
-            product.dimension = dimension or None
-            product.comment = comment or None
-            product.published = published
-            product.barcode = barcode or None
-            product.quantity = qty
-            product.price = price
-        else:
-            product = Product(
-                external_id=external_id or None,
-                name=name,
-                dimension=dimension or None,
-                comment=comment or None,
-                published=published,
-                barcode=barcode or None,
-                quantity=qty,
-                price=price,
-            )
-            self.session.add(product)
+                if barcode_owner is not None and barcode_owner is not product:
+                    messagebox.showerror("Klaida", f"Barkodas {barcode} jau naudojamas kitai prekei.")
+                    return
+                if external_owner is not None and external_owner is not product:
+                    messagebox.showerror("Klaida", f"Parduotuvės ID {external_id} jau priskirtas kitai prekei.")
+                    return
+
+                if product:
+                    product.external_id = external_id or None
+                    product.name = name
+                    product.dimension = dimension or None
+                    product.comment = comment or None
+                    product.published = published
+                    product.barcode = barcode or None
+                    product.quantity = qty
+                    product.price = price
+                else:
+                    product = Product(
+                        external_id=external_id or None,
+                        name=name,
+                        dimension=dimension or None,
+                        comment=comment or None,
+                        published=published,
+                        barcode=barcode or None,
+                        quantity=qty,
+                        price=price,
+                    )
+                    self.session.add(product)
 
-        try:
-            self.session.commit()
             self.active_product_id = product.id
-            self.load_products()
+            self.sync_tree_row(product.id, product)
             self.select_tree_row(product.id)
             self.show_status("Prekė išsaugota.", "success")
         except Exception as exc:  # pragma: no cover
-            self.session.rollback()
             messagebox.showerror("DB klaida", f"Nepavyko išsaugoti: {exc}")
 
     def delete_product(self) -> None:
@@ -597,15 +850,15 @@ class App(tk.Tk):
             return
         if not messagebox.askyesno("Patvirtinimas", f"Ištrinti „{product.name}“?"):
             return
+        product_id = product.id
         try:
-            self.session.delete(product)
-            self.session.commit()
+            with self.session.begin():
+                self.session.delete(product)
             self.active_product_id = None
-            self.load_products()
+            self.sync_tree_row(product_id)
             self.clear_form()
             self.show_status("Prekė pašalinta.", "danger")
         except Exception as exc:  # pragma: no cover
-            self.session.rollback()
             messagebox.showerror("DB klaida", f"Nepavyko ištrinti: {exc}")
 
     def on_select(self) -> None:
@@ -641,9 +894,20 @@ class App(tk.Tk):
         self.qty_var.set(str(new_value))
         self.update_total()
 
+    def schedule_total(self) -> None:
+        # skeneris ar greitas rinkimas keicia lauka daug kartu; suma perskaiciuojama tik nurimus
+        if self.total_after:
+            self.after_cancel(self.total_after)
+        self.total_after = self.after(50, self.update_total)
+
     def update_total(self) -> None:
-        qty = parse_int_or_zero(self.qty_var.get())
-        price = parse_price(self.price_var.get())
+        self.total_after = None
+        inputs = (self.qty_var.get(), self.price_var.get())
+        if inputs == self.total_inputs:
+            return
+        self.total_inputs = inputs
+        qty = parse_int_or_zero(inputs[0])
+        price = parse_price(inputs[1])
         self.total_var.set(f"{qty * price:.2f}")
 
     def search_products(self) -> None:
@@ -652,17 +916,24 @@ class App(tk.Tk):
             self.load_products()
             self.show_status("Rodomos visos prekės.")
             return
-        lowered_term = f"%{term.lower()}%"
-        query = self.session.query(Product).filter(
-            func.lower(Product.name).like(lowered_term)
-            | Product.barcode.like(f"%{term}%")
-            | func.lower(func.coalesce(Product.external_id, "")).like(lowered_term)
-            | func.lower(func.coalesce(Product.comment, "")).like(lowered_term)
-            | func.lower(func.coalesce(Product.dimension, "")).like(lowered_term)
-        )
-        results = query.order_by(func.lower(Product.name)).all()
-        self.load_products(results)
-        self.show_status(f'Rasta {len(results)} pagal "{term}".')
+        if HAS_FTS and len(term) >= 3:
+            # trigram MATCH su kabutemis = substring paieska visuose FTS stulpeliuose
+            matches = text("SELECT rowid FROM products_fts WHERE products_fts MATCH :term").bindparams(
+                term='"' + term.replace('"', '""') + '"'
+            ).columns(Product.id)
+            query = select(*PRODUCT_ROW_COLUMNS).where(Product.id.in_(matches))
+        else:
+            # trumpesnis nei trigrama terminas per FTS nerastu nieko
+            lowered_term = f"%{term.lower()}%"
+            query = select(*PRODUCT_ROW_COLUMNS).where(
+                func.lower(Product.name).like(lowered_term)
+                | Product.barcode.like(f"%{term}%")
+                | func.lower(func.coalesce(Product.external_id, "")).like(lowered_term)
+                | func.lower(func.coalesce(Product.comment, "")).like(lowered_term)
+                | func.lower(func.coalesce(Product.dimension, "")).like(lowered_term)
+            )
+        self.load_products(query)
+        self.show_status(f'Rasta {self.view_total} pagal "{term}".')
 
     def reset_search(self) -> None:
         self.search_var.set("")
@@ -673,7 +944,10 @@ class App(tk.Tk):
         if not product_id:
             return
         iid = str(product_id)
-        if iid in self.product_tree.get_children(""):
+        # preke gali buti dar neuzkrautame puslapyje
+        while not self.product_tree.exists(iid) and self.load_next_page():
+            pass
+        if self.product_tree.exists(iid):
             self.product_tree.selection_set(iid)
             self.product_tree.see(iid)
 
@@ -684,36 +958,32 @@ class App(tk.Tk):
     # ---------- Barcode ----------
     def handle_barcode_input(self) -> None:
         value = self.barcode_var.get().strip()
-        if re.match(r"^[+-]\d+:\S+$", value):
+        if _BARCODE_ACTION_RE.match(value):
             self.process_barcode_action(value)
             self.barcode_var.set("")
         else:
             self.save_product()
 
     def process_barcode_action(self, barcode_action: str) -> None:
-        match = re.match(r"^([+-])(\d+):(\S+)$", barcode_action.strip())
+        match = _BARCODE_ACTION_RE.match(barcode_action.strip())
         if not match:
             messagebox.showerror("Klaida", "Netinkamas barkodo formatas (+2:123...).")
             return
 
         sign, qty_str, barcode = match.groups()
         qty_delta = int(qty_str)
-        product = self.session.query(Product).filter(Product.barcode == barcode).first()
-        if not product:
-            messagebox.showerror("Klaida", f"Nerasta prekė su barkodu {barcode}.")
-            return
-
-        if sign == "+":
-            product.quantity = (product.quantity or 0) + qty_delta
-        else:
-            product.quantity = max(0, (product.quantity or 0) - qty_delta)
-
+        # vienas atominis UPDATE ... RETURNING vietoj SELECT ir objekto keitimo; grazinta preke reikalinga sarasui
+        stmt = _BARCODE_ADD_STMT if sign == "+" else _BARCODE_SUBTRACT_STMT
         try:
-            self.session.commit()
-            self.load_products()
+            with self.session.begin():
+                params = {"scanned_barcode": barcode, "delta": qty_delta}
+                product = self.session.execute(stmt, params).scalars().first()
+                if not product:
+                    messagebox.showerror("Klaida", f"Nerasta prekė su barkodu {barcode}.")
+                    return
+            self.sync_tree_row(product.id, product)
             self.show_status(f"Kiekis atnaujintas ({product.quantity} vnt.).", "success")
         except Exception as exc:  # pragma: no cover
-            self.session.rollback()
             messagebox.showerror("DB klaida", f"Nepavyko atnaujinti kiekio: {exc}")
 
     # ---------- Importas / eksportas ----------
@@ -734,174 +1004,263 @@ class App(tk.Tk):
             messagebox.showerror("Formatas", "Palaikomi tik CSV failai.")
             return
 
-        def load_dataframe(file_path: str) -> "pd.DataFrame":
+        def read_chunks(file_path: str) -> Iterator["pd.DataFrame"]:
+            # failas skaitomas IMPORT_CHUNK_ROWS eiluciu dalimis, kad visas CSV nebutu atmintyje vienu metu
             try:
-                df_local = pd.read_csv(
+                # skirtukas atpazistamas is failo pradzios, kad butu galima naudoti greita C parseri
+                with open(file_path, "rb") as handle:
+                    sample = handle.read(65536).decode("utf-8", "ignore")
+                if "\n" in sample:
+                    sample = sample.rsplit("\n", 1)[0]
+                dialect = csv.Sniffer().sniff(sample, delimiters=";,\t|")
+                reader = pd.read_csv(
                     file_path,
                     header=0,
                     keep_default_na=False,
+                    na_filter=False,
                     dtype=str,
-                    sep=None,
-                    engine="python",
+                    sep=dialect.delimiter,
+                    engine="c",
+                    chunksize=IMPORT_CHUNK_ROWS,
                 )
+                for chunk in reader:
+                    # tuscios eilutes atmetamos vektorine kauke po stulpeli, be Python kvietimo kiekvienam langeliui
+                    stripped = chunk.apply(lambda column: column.str.strip())
+                    yield chunk.loc[stripped.ne("").any(axis=1)]
             except Exception as exc:
                 raise ValueError(f"Nepavyko perskaityti CSV failo: {exc}") from exc
 
-            df_local = df_local.fillna("")
-            df_local = df_local[~df_local.apply(lambda row: all(not normalize_text(str(v)) for v in row), axis=1)]
-            if df_local.empty:
-                raise ValueError("Faile nerasta duomenu.")
-            df_local.reset_index(drop=True, inplace=True)
-            return df_local
-
+        chunks = read_chunks(path)
         try:
-            df = load_dataframe(path)
+            first_chunk = next(chunks, None)
         except ValueError as exc:
             messagebox.showerror("Klaida", str(exc))
             return
+        if first_chunk is None:
+            messagebox.showerror("Klaida", "Faile nerasta duomenu.")
+            return
+        columns = first_chunk.columns
 
-        field_definitions = [
-            ("external_id", "ID", {"id", "prekės kodas", "prekes kodas", "sku"}, ""),
-            ("name", "Pavadinimas", {"pavadinimas", "name", "title"}, ""),
-            ("dimension", "Matmuo", {"matmuo", "matmenys", "dimensions", "size", "matmenys (cm)"}, ""),
-            (
-                "comment",
-                "Komentaras",
-                {"komentaras", "aprašymas", "aprasymas", "description", "trumpas apibūdinimas", "pirkimo pastaba"},
-                "",
-            ),
-            ("published", "Paskelbtas", {"paskelbtas", "published"}, ""),
-            ("barcode", "Barkodas", {"gtin, upc, ean, or isbn", "ean", "barkodas", "barcode"}, ""),
-            ("quantity", "Kiekis", {"atsargos", "kiekis", "likutis", "stock", "qty"}, ""),
-            ("price", "Kaina", {"kaina", "kaina (eur)", "price", "price eur"}, ""),
-            ("total", "Bendra", {"bendra", "bendra (eur)", "total", "suma"}, ""),
-            ("date", "Data", {"data", "date"}, ""),
-        ]
-
-        def normalize_header(value: str) -> str:
-            return normalize_text(value).strip('"').lstrip("﻿").lower()
-
-        header_lookup = {normalize_header(str(column)): str(column) for column in df.columns}
+        header_lookup = {normalize_header(str(column)): str(column) for column in columns}
         resolved_columns: dict[str, str] = {}
-        default_values = {key: default for key, _, _, default in field_definitions}
-
-        for key, label, aliases, _ in field_definitions:
-            normalized_label = normalize_header(label)
-            candidates = set(aliases)
-            candidates.add(normalized_label)
-            for candidate in candidates:
-                column = header_lookup.get(candidate)
-                if column:
-                    resolved_columns[key] = column
-                    break
-
-        if "name" not in resolved_columns and len(df.columns) > 0:
-            resolved_columns["name"] = df.columns[0]
-
-        missing_fields = [key for key, _, _, _ in field_definitions if key not in resolved_columns and key != "name"]
+        # vienas praejimas per failo stulpelius; keliems tinkamiems stulpeliams imamas pirmasis
+        for header, column in header_lookup.items():
+            key = IMPORT_HEADER_KEYS.get(header)
+            if key:
+                resolved_columns.setdefault(key, column)
+        default_values = {key: default for key, _, _, default in IMPORT_FIELDS}
+
+        if "name" not in resolved_columns and len(columns) > 0:
+            resolved_columns["name"] = columns[0]
+
+        missing_fields = [key for key, _, _, _ in IMPORT_FIELDS if key not in resolved_columns and key != "name"]
         if missing_fields:
-            preview = ", ".join(label for key, label, _, _ in field_definitions if key in missing_fields[:4])
+            preview = ", ".join(label for key, label, _, _ in IMPORT_FIELDS if key in missing_fields[:4])
             suffix = "..." if len(missing_fields) > 4 else ""
             self.show_status(f"Trūksta stulpelių: {preview}{suffix}")
 
-        def pick_field(row: "pd.Series", field: str) -> str:
-            column = resolved_columns.get(field)
-            if not column or column not in row.index:
-                return default_values.get(field, "")
-            value = row.get(column, "")
-            if value is None or (isinstance(value, float) and pd.isna(value)):
-                return default_values.get(field, "")
-            return str(value)
-        def pick_field(row: "pd.Series", field: str) -> str:
-            column = resolved_columns.get(field)
-            if not column or column not in row.index:
-                return ""
-            value = row.get(column, "")
-            return "" if value is None else str(value)
-
-        imported, updated, duplicates = 0, 0, 0
-        seen: set[tuple[str, str, str, str, str, int, float, str]] = set()
-        total_rows = len(df)
-
-        for _, row in df.iterrows():
-            name = normalize_text(pick_field(row, "name"))
-            if not name:
-                continue
-
-            external_id = normalize_text(pick_field(row, "external_id"))
-            barcode = normalize_barcode_value(pick_field(row, "barcode"))
-            if not barcode:
-                barcode = normalize_barcode_value(external_id)
-
-            dimension = normalize_text(pick_field(row, "dimension"))
-            comment = normalize_text(pick_field(row, "comment"))
-
-            qty = parse_int_or_zero(pick_field(row, "quantity"))
-            price = parse_price(pick_field(row, "price"))
-            total_value = parse_price(pick_field(row, "total"))
-            if price == 0 and qty > 0 and total_value > 0:
-                price = round(total_value / max(qty, 1), 2)
-
-            published = normalize_published_value(pick_field(row, "published"))
-            record_date = parse_date_value(pick_field(row, "date"))
-
-            row_key = (
-                external_id.lower(),
-                barcode.lower(),
-                name.lower(),
-                dimension.lower(),
-                comment.lower(),
-                qty,
-                price,
-                published.lower(),
+        # Jau matytu eiluciu maisos (dublikatai) atsimenamos per visas failo dalis.
+        seen: set[int] = set()
+
+        def import_chunk(df: "pd.DataFrame") -> tuple[int, int, int]:
+            imported, updated, duplicates = 0, 0, 0
+            # Nauji produktai kaupiami kaip dict'ai ir irasomi executemany paketais, be ORM objektu eilutei.
+            new_rows: list[dict] = []
+
+            # 1 etapas: stulpeliai normalizuojami vektoriskai visai daliai, o ne kiekvienai eilutei per iterrows.
+            fields = pd.DataFrame(
+                {
+                    key: df[resolved_columns[key]].astype(str) if key in resolved_columns else default_values[key]
+                    for key, _, _, _ in IMPORT_FIELDS
+                },
+                index=df.index,
             )
-            if row_key in seen:
-                duplicates += 1
-                continue
-            seen.add(row_key)
-
-            product = None
-            if barcode:
-                product = self.session.query(Product).filter(Product.barcode == barcode).first()
-            if not product and external_id:
-                product = self.session.query(Product).filter(Product.external_id == external_id).first()
-            if not product:
-                product = self.session.query(Product).filter(func.lower(Product.name) == name.lower()).first()
-
-            if product:
-                if external_id:
-                    product.external_id = external_id
-                product.name = name
-                product.dimension = dimension or None
-                product.comment = comment or None
-                product.published = published
-                if barcode:
-                    product.barcode = barcode
-                product.quantity = qty
-                product.price = price
-                if record_date:
-                    product.added_at = record_date
-                updated += 1
-            else:
-                new_product = Product(
-                    external_id=external_id or None,
-                    name=name,
-                    dimension=dimension or None,
-                    comment=comment or None,
-                    barcode=barcode or None,
-                    quantity=qty,
-                    price=price,
-                    published=published,
-                    added_at=record_date or date.today(),
-                )
-                self.session.add(new_product)
-                imported += 1
 
+            def text_column(field: str) -> "pd.Series":
+                return fields[field].str.strip()
+
+            def barcode_column(field: str) -> "pd.Series":
+                values = text_column(field)
+                return values.where(~values.isin({"0", "00", "000"}), "")
+
+            def number_column(field: str, parse) -> "pd.Series":
+                # to_numeric sutvarko daugumą reiksmiu; tuscios ir netipines ("1_000", "nan") eina per parse funkcija
+                raw = text_column(field).str.replace(",", ".", regex=False)
+                numbers = pd.to_numeric(raw, errors="coerce").astype(float)
+                leftover = numbers.isna()
+                if leftover.any():
+                    numbers[leftover] = raw[leftover].map(parse)
+                return numbers
+
+            def round_price(value: float) -> float:
+                return round(value, 2)
+
+            external_id_values = text_column("external_id")
+            barcode_values = barcode_column("barcode")
+            barcode_values = barcode_values.where(barcode_values != "", barcode_column("external_id"))
+            qty_values = number_column("quantity", parse_int_or_zero)
+            qty_values = qty_values.where(qty_values.abs() != float("inf"), 0).astype("int64")
+            price_values = number_column("price", parse_price).map(round_price)
+            total_values = number_column("total", parse_price).map(round_price)
+            derive_price = (price_values == 0) & (qty_values > 0) & (total_values > 0)
+            if derive_price.any():
+                price_values[derive_price] = (total_values[derive_price] / qty_values[derive_price]).map(round_price)
+            rows = pd.DataFrame(
+                {
+                    "name": text_column("name"),
+                    "external_id": external_id_values,
+                    "barcode": barcode_values,
+                    "dimension": text_column("dimension"),
+                    "comment": text_column("comment"),
+                    "quantity": qty_values,
+                    "price": price_values,
+                    "published": fields["published"].map(normalize_published_value),
+                    "added_at": fields["date"].map(parse_date_value),
+                }
+            )
+            rows = rows[rows["name"] != ""]
+
+            # dublikatai atpazistami pagal 64 bitu eilutes maisa, skaiciuojama vektoriskai visai daliai
+            key_columns = ("external_id", "barcode", "name", "dimension", "comment", "published")
+            row_keys = pd.util.hash_pandas_object(
+                rows.assign(**{column: rows[column].str.lower() for column in key_columns})[
+                    ["external_id", "barcode", "name", "dimension", "comment", "quantity", "price", "published"]
+                ],
+                index=False,
+            )
+            unique = ~row_keys.duplicated() & ~row_keys.isin(seen)
+            duplicates += len(rows) - int(unique.sum())
+            seen.update(row_keys[unique].tolist())
+            rows = rows[unique]
+
+            # surenkami raktai, pagal kuriuos ieskoma esamu prekiu
+            parsed_rows: list[dict] = []
+            barcodes: set[str] = set()
+            external_ids: set[str] = set()
+            names_lower: set[str] = set()
+            for row in rows.itertuples(index=False):
+                parsed_rows.append(row._asdict())
+                if row.barcode:
+                    barcodes.add(row.barcode)
+                if row.external_id:
+                    external_ids.add(row.external_id)
+                names_lower.add(row.name.lower())
+
+            # kiekviena failo dalis - atskira transakcija; klaidos atveju begin() atsaukia tik ja
+            with self.session.begin():
+                # 2 etapas: esamu prekiu id uzkraunami IN uzklausu paketais, o ne 3 SELECT kiekvienai eilutei.
+                by_barcode: dict[str, int] = {}
+                by_external_id: dict[str, int] = {}
+                by_name: dict[str, int] = {}
+                for chunk in chunked(barcodes):
+                    by_barcode.update(
+                        (code, product_id)
+                        for product_id, code in self.session.execute(
+                            select(Product.id, Product.barcode).where(Product.barcode.in_(chunk))
+                        )
+                    )
+                for chunk in chunked(external_ids):
+                    by_external_id.update(
+                        (code, product_id)
+                        for product_id, code in self.session.execute(
+                            select(Product.id, Product.external_id).where(Product.external_id.in_(chunk))
+                        )
+                    )
+                lowered_name = func.lower(Product.name)
+                for chunk in chunked(names_lower):
+                    query = select(Product.id, lowered_name).where(lowered_name.in_(chunk)).order_by(Product.id)
+                    # kaip .first(): esant keliems vienodiems pavadinimams imama seniausia preke
+                    for product_id, key in self.session.execute(query):
+                        by_name.setdefault(key, product_id)
+
+                # Atnaujinimai kaupiami pagal id; ta pati preke keliose eilutese gauna paskutines reiksmes.
+                updates: dict[int, dict] = {}
+                for values in parsed_rows:
+                    name = values["name"]
+                    external_id = values["external_id"]
+                    barcode = values["barcode"]
+                    record_date = values["added_at"]
+
+                    product_id = None
+                    if barcode:
+                        product_id = by_barcode.get(barcode)
+                    if not product_id and external_id:
+                        product_id = by_external_id.get(external_id)
+                    if not product_id:
+                        product_id = by_name.get(name.lower())
+
+                    if product_id:
+                        changes = updates.setdefault(product_id, {"id": product_id})
+                        if external_id:
+                            changes["external_id"] = external_id
+                        changes["name"] = name
+                        changes["dimension"] = values["dimension"] or None
+                        changes["comment"] = values["comment"] or None
+                        changes["published"] = values["published"]
+                        if barcode:
+                            changes["barcode"] = barcode
+                        changes["quantity"] = values["quantity"]
+                        changes["price"] = values["price"]
+                        if record_date:
+                            changes["added_at"] = record_date
+                        updated += 1
+                    else:
+                        new_rows.append(
+                            {
+                                "external_id": external_id or None,
+                                "name": name,
+                                "dimension": values["dimension"] or None,
+                                "comment": values["comment"] or None,
+                                "barcode": barcode or None,
+                                "quantity": values["quantity"],
+                                "price": values["price"],
+                                "published": values["published"],
+                                "added_at": record_date or date.today(),
+                            }
+                        )
+                        imported += 1
+                        if len(new_rows) >= IMPORT_BATCH_SIZE:
+                            self.session.execute(insert(Product), new_rows)
+                            new_rows.clear()
+
+                if new_rows:
+                    self.session.execute(insert(Product), new_rows)
+                if updates:
+                    # ORM bulk UPDATE pagal pirmini rakta; id tvarka kaip ORM flush, kad UNIQUE patikros sutaptu
+                    self.session.execute(update(Product), [updates[product_id] for product_id in sorted(updates)])
+            return imported, updated, duplicates
+
+        imported, updated, duplicates, total_rows = 0, 0, 0, 0
         try:
-            self.session.commit()
+            for df in chain([first_chunk], chunks):
+                chunk_counts = import_chunk(df)
+                # skaiciuojamos tik irasytos dalys, kad klaidos pranesimas rodytu, kas jau importuota
+                total_rows += len(df)
+                imported += chunk_counts[0]
+                updated += chunk_counts[1]
+                duplicates += chunk_counts[2]
+        except ValueError as exc:
+            error = ("Klaida", str(exc))
         except Exception as exc:  # pragma: no cover
-            self.session.rollback()
-            messagebox.showerror("DB klaida", f"Nepavyko importuoti: {exc}")
+            error = ("DB klaida", f"Nepavyko importuoti: {exc}")
+        else:
+            error = None
+        finally:
+            # sesijoje likusios Product kopijos perskaitomos is DB kita karta jas naudojant
+            self.session.expire_all()
+
+        if error:
+            title, message = error
+            if imported or updated:
+                # ankstesnes failo dalys jau irasytos; pakartotinai importuojant jos bus atnaujintos, ne naujos
+                self.load_products()
+                message += "\n\nIki klaidos ikelta nauju: {0}, atnaujinta: {1} (apdorota eiluciu: {2}).".format(
+                    imported, updated, total_rows
+                )
+            messagebox.showerror(title, message)
+            return
+        if not total_rows:
+            messagebox.showerror("Klaida", "Faile nerasta duomenu.")
             return
 
         self.load_products()
@@ -913,10 +1272,6 @@ class App(tk.Tk):
         )
 
     def export_excel(self) -> None:
-        if not HAS_PANDAS:
-            messagebox.showerror("Priklausomybės", "Reikalingas pandas (pip install pandas).")
-            return
-
         today = date.today().strftime("%Y-%m-%d")
         path = filedialog.asksaveasfilename(
             title="Išsaugoti CSV",
@@ -931,38 +1286,47 @@ class App(tk.Tk):
             path = f"{path}.csv"
 
         try:
-            products = self.session.query(Product).order_by(func.lower(Product.name)).all()
-            data = []
-            for product in products:
-                qty = product.quantity or 0
-                price = product.price or 0.0
-                data.append({
-                    "Parduotuvės ID": product.external_id or "",
-                    "Pavadinimas": product.name,
-                    "Matmuo": product.dimension or "",
-                    "Komentaras": product.comment or "",
-                    "Paskelbta": normalize_published_value(product.published or ""),
-                    "Barkodas": product.barcode or "",
-                    "Kiekis": qty,
-                    "Kaina (EUR)": f"{price:.2f}",
-                    "Bendra (EUR)": f"{qty * price:.2f}",
-                    "Data": product.added_at.strftime("%Y-%m-%d") if product.added_at else today,
-                })
-
-            df = pd.DataFrame(data)
-            df.to_csv(path, index=False, encoding="utf-8-sig")
+            # eilutes imamos is kursoriaus po 1000 ir rasomos tiesiai i faila, be pandas ir tarpiniu sarasu
+            rows = self.read_conn.execute(
+                select(*PRODUCT_ROW_COLUMNS).order_by(func.lower(Product.name)).execution_options(yield_per=1000)
+            )
+            with open(path, "w", newline="", encoding="utf-8-sig") as handle:
+                writer = csv.writer(handle, lineterminator=os.linesep)
+                writer.writerow(EXPORT_HEADERS)
+                for _, external_id, name, dimension, comment, published, barcode, quantity, price, added_at in rows:
+                    quantity = int(quantity or 0)
+                    price = float(price or 0.0)
+                    writer.writerow((
+                        external_id or "",
+                        name,
+                        dimension or "",
+                        comment or "",
+                        normalize_published_value(published or ""),
+                        barcode or "",
+                        quantity,
+                        f"{price:.2f}",
+                        f"{quantity * price:.2f}",
+                        added_at.strftime("%Y-%m-%d") if isinstance(added_at, date) else today,
+                    ))
             messagebox.showinfo("Eksportas", f"CSV išsaugotas:\n{os.path.abspath(path)}")
         except Exception as exc:  # pragma: no cover
             messagebox.showerror("Klaida", f"Nepavyko eksportuoti: {exc}")
 
     # ---------- Statistika ir statusai ----------
     def update_stats(self) -> None:
-        products = self.session.query(Product).all()
-        total_qty = sum(product.quantity or 0 for product in products)
-        total_value = sum((product.quantity or 0) * (product.price or 0.0) for product in products)
+        # viena agregato uzklausa vietoj visu prekiu uzkrovimo i Python
+        quantity = func.coalesce(Product.quantity, 0)
+        total_qty, total_value, sku_count = self.read_conn.execute(
+            select(
+                func.coalesce(func.sum(quantity), 0),
+                func.coalesce(func.sum(quantity * func.coalesce(Product.price, 0.0)), 0.0),
+                func.count(Product.id),
+            )
+        ).one()
         self.stats_qty_var.set(f"{total_qty} vnt.")
         self.stats_value_var.set(f"{total_value:.2f} EUR")
-        self.stats_sku_var.set(f"{len(products)} SKU")
+        self.stats_sku_var.set(f"{sku_count} SKU")
+        self.product_count = sku_count
 
     def show_status(self, message: str, level: str = "info") -> None:
         palette = {